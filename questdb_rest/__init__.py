@@ -6,6 +6,16 @@ from urllib.parse import urlencode, urljoin
 from typing import List, Optional, Dict, Any, Union, IO, Tuple
 from questdb_rest.utils import _qdb_exec_result_dict_extract_field
 
+try:
+    # Optional: orjson decodes large /exec responses (e.g. tables()) much
+    # faster than the stdlib. Its JSONDecodeError subclasses json's, so the
+    # existing except clauses still apply.
+    import orjson
+
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
 # --------------------
 # consts
 # --------------------
@@ -30,6 +40,23 @@ Enable shell completion with this command:
 
 logger = logging.getLogger(__name__)
 
+# --- Helpers ---
+
+
+def detect_scheme_in_host(host_str):
+    """
+    Detect if the host string already includes a URL scheme (http:// or https://).
+    Returns a tuple of (scheme, actual_host) if scheme is detected, or (None, host_str) if not.
+    """
+    if not host_str:
+        return (None, host_str)
+    if host_str.startswith("http://"):
+        return ("http", host_str[7:])  # Remove "http://" prefix
+    elif host_str.startswith("https://"):
+        return ("https", host_str[8:])  # Remove "https://" prefix
+    return (None, host_str)  # No scheme detected in host string
+
+
 # --- Custom Exceptions ---
 
 
@@ -151,6 +178,74 @@ class QuestDBClient:
             scheme=scheme,
         )
 
+    @classmethod
+    def from_options(
+        cls,
+        host: Optional[str] = None,
+        port: Optional[int] = None,
+        user: Optional[str] = None,
+        password: Optional[str] = None,
+        timeout: Optional[int] = None,
+        scheme: Optional[str] = None,
+        config_path: Optional[str] = None,
+    ) -> "QuestDBClient":
+        """
+        Builds a client from qdb-cli style connection options, any of which may
+        be None (not given). A scheme in 'host' (e.g. "https://db") is used
+        unless 'scheme' is given. With 'config_path', that file supplies the
+        settings not given here; otherwise the constructor's defaults and
+        ~/.questdb-rest/config.json do.
+
+        Raises:
+            FileNotFoundError, json.JSONDecodeError, KeyError: For an unusable
+                'config_path'.
+            ValueError: For an invalid host or port.
+        """
+        if host:
+            detected_scheme, host = detect_scheme_in_host(host)
+            if detected_scheme:
+                logger.debug(f"Detected scheme '{detected_scheme}://' in host")
+                # Only override if scheme wasn't given explicitly
+                if scheme is None:
+                    scheme = detected_scheme
+        # Filter out None values so the client uses its defaults/config loading
+        kwargs = {
+            k: v
+            for k, v in (
+                ("host", host),
+                ("port", port),
+                ("user", user),
+                ("password", password),
+                ("timeout", timeout),
+                ("scheme", scheme),
+            )
+            if v is not None
+        }
+        if config_path is None:
+            return cls(**kwargs)
+        # Load base settings from the specified config file, then let the
+        # given options take priority over it
+        base_client = cls.from_config_file(config_path)
+        base_url_parts = base_client.base_url.split("://")
+        base_scheme = base_url_parts[0]
+        host_port_parts = base_url_parts[1].split(":")
+        base_host = host_port_parts[0]
+        base_port = (
+            int(host_port_parts[1].split("/")[0])
+            if len(host_port_parts) > 1 and host_port_parts[1].split("/")[0].isdigit()
+            else cls.DEFAULT_PORT
+        )
+        base_user = base_client.auth[0] if base_client.auth else None
+        base_password = base_client.auth[1] if base_client.auth else None
+        return cls(
+            host=kwargs.get("host", base_host),
+            port=kwargs.get("port", base_port),
+            user=kwargs.get("user", base_user),
+            password=kwargs.get("password", base_password),
+            timeout=kwargs.get("timeout", base_client.timeout),
+            scheme=kwargs.get("scheme", base_scheme),
+        )
+
     def _build_url(self, endpoint: str, params: Optional[Dict[str, Any]] = None) -> str:
         """Builds the full URL for an API endpoint."""
         url = urljoin(self.base_url, endpoint.lstrip("/"))
@@ -495,7 +590,7 @@ class QuestDBClient:
         response = self._request("GET", "/exec", params=params, headers=headers)
 
         try:
-            return response.json()
+            return _json_loads(response.content)
         except json.JSONDecodeError as e:
             msg = f"Failed to decode JSON response from /exec. Content: {response.text[:200]}"
             logger.error(msg)
@@ -565,7 +660,7 @@ class QuestDBClient:
         response = self._request("GET", "/chk", params=params)
 
         try:
-            return response.json()
+            return _json_loads(response.content)
         except json.JSONDecodeError as e:
             msg = f"Failed to decode JSON response from /chk. Content: {response.text[:200]}"
             logger.error(msg)
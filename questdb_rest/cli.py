@@ -40,6 +40,7 @@ from questdb_rest import (
     QuestDBAPIError,
     __version__,
     CLI_EPILOG,
+    detect_scheme_in_host,
 )
 
 _EXEC_EXTRACT_FIELD_SENTINEL = object()
@@ -2565,20 +2566,6 @@ def handle_mcp(args, client: Any = None):
     run_server()
 
 
-def detect_scheme_in_host(host_str):
-    """
-    Detect if the host string already includes a URL scheme (http:// or https://).
-    Returns a tuple of (scheme, actual_host) if scheme is detected, or (None, host_str) if not.
-    """
-    if not host_str:
-        return (None, host_str)
-    if host_str.startswith("http://"):
-        return ("http", host_str[7:])  # Remove "http://" prefix
-    elif host_str.startswith("https://"):
-        return ("https", host_str[8:])  # Remove "https://" prefix
-    return (None, host_str)  # No scheme detected in host string
-
-
 def _add_parser_global(parser: argparse.ArgumentParser):
     """Adds global arguments to the main parser."""
     # "-V",
@@ -3511,67 +3498,23 @@ def main():
     client = None
     if args.requires_client and (not args.dry_run):
         try:
-            # Check if host already contains a scheme
-            detected_scheme = None
-            actual_host = args.host
-            final_scheme = args.scheme  # Start with CLI arg scheme
-            if args.host:
-                detected_scheme, actual_host = detect_scheme_in_host(args.host)
-                if detected_scheme:
-                    logger.debug(
-                        f"Detected scheme '{detected_scheme}://' in host parameter: '{args.host}'"
-                    )
-                    # Override scheme if detected in host, unless explicitly provided via --scheme
-                    if final_scheme is None:  # Only override if --scheme wasn't given
-                        final_scheme = detected_scheme  # Use the host without scheme
-            # Use potentially prompted/config password
-            # Use the finally decided scheme
-            client_kwargs = {
-                "host": actual_host,
-                "port": args.port,
-                "user": args.user,
-                "password": actual_password,
-                "timeout": args.timeout,
-                "scheme": final_scheme,
-            }
-            # Filter out None values so client uses its defaults/config loading
-            filtered_kwargs = {k: v for k, v in client_kwargs.items() if v is not None}
+            # Host scheme detection, None filtering and --config merging are
+            # shared with the other scripts via QuestDBClient.from_options
             if args.config:
-                # If a specific config file is given via --config, use from_config_file
                 # We prioritize command-line args over the config file if both are present.
-                # Use from_config_file first, then override with CLI args.
                 try:
                     logger.info(
                         f"Loading configuration from specified file: {args.config}"
                     )
-                    # Load base settings from the specified config file
-                    base_client = QuestDBClient.from_config_file(args.config)
-                    # Prepare overrides from CLI args (only if they were actually provided)
-                    # Use filtered_kwargs which already has the resolved CLI args + password + scheme
-                    # Get the base client's values to compare
-                    base_url_parts = base_client.base_url.split("://")
-                    base_scheme = base_url_parts[0]
-                    host_port_parts = base_url_parts[1].split(":")
-                    base_host = host_port_parts[0]
-                    base_port = (
-                        int(host_port_parts[1].split("/")[0])
-                        if len(host_port_parts) > 1
-                        and host_port_parts[1].split("/")[0].isdigit()
-                        else QuestDBClient.DEFAULT_PORT
+                    client = QuestDBClient.from_options(
+                        host=args.host,
+                        port=args.port,
+                        user=args.user,
+                        password=actual_password,
+                        timeout=args.timeout,
+                        scheme=args.scheme,
+                        config_path=args.config,
                     )
-                    base_user = base_client.auth[0] if base_client.auth else None
-                    base_password = base_client.auth[1] if base_client.auth else None
-                    base_timeout = base_client.timeout
-                    # Build final kwargs prioritizing CLI args (already in filtered_kwargs) over config file
-                    final_kwargs_from_config = {
-                        "host": filtered_kwargs.get("host", base_host),
-                        "port": filtered_kwargs.get("port", base_port),
-                        "user": filtered_kwargs.get("user", base_user),
-                        "password": filtered_kwargs.get("password", base_password),
-                        "timeout": filtered_kwargs.get("timeout", base_timeout),
-                        "scheme": filtered_kwargs.get("scheme", base_scheme),
-                    }
-                    client = QuestDBClient(**final_kwargs_from_config)
                     logger.debug(
                         f"Client initialized from {args.config} and potentially updated with CLI args."
                     )
@@ -3589,7 +3532,14 @@ def main():
                 logger.debug(
                     "Initializing client using command-line arguments and/or default config (~/.questdb-rest/config.json)."
                 )
-                client = QuestDBClient(**filtered_kwargs)
+                client = QuestDBClient.from_options(
+                    host=args.host,
+                    port=args.port,
+                    user=args.user,
+                    password=actual_password,
+                    timeout=args.timeout,
+                    scheme=args.scheme,
+                )
             # Log final connection details (mask password)
             log_host = client.base_url.split("://")[1].split(":")[0]
             # Correctly extract port even without trailing slash
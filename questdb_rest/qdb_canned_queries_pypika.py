@@ -2,25 +2,14 @@
 # questdb_rest/qdb_canned_queries_pypika.py
 
 import argparse
+import functools
+import os
 from rich_argparse import RawTextRichHelpFormatter
-import subprocess
 import sys
 from typing import List, Optional
 
-# Attempt to import pypika, provide guidance if missing
-try:
-    # Use LiteralValue for direct QuestDB syntax where needed
-    from pypika import Query, Table, Field
-    from pypika.terms import LiteralValue
-except ImportError:
-    print(
-        "Error: pypika library not found. Please install it: pip install pypika",
-        file=sys.stderr,
-    )
-    sys.exit(1)
-
-
 # --- Argument Parsing ---
+@functools.lru_cache(maxsize=1)
 def setup_arg_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(
         description="Run a canned QuestDB query using pypika, reading table names from args or stdin.",
@@ -93,6 +82,17 @@ def setup_arg_parser() -> argparse.ArgumentParser:
 # --- SQL Query Building ---
 def build_sql_query(mode: str, table_name: str, col_name: Optional[str] = None) -> str:
     """Builds the SQL query using pypika, ensuring identifiers are quoted."""
+    # Imported on first use so --help and argument errors don't pay for pypika
+    try:
+        # Use LiteralValue for direct QuestDB syntax where needed
+        from pypika import Query, Table, Field
+        from pypika.terms import LiteralValue
+    except ImportError:
+        print(
+            "Error: pypika library not found. Please install it: pip install pypika",
+            file=sys.stderr,
+        )
+        sys.exit(1)
 
     # Use pypika's Table to handle quoting of the table name automatically
     # Pypika usually uses double quotes by default which works for QuestDB
@@ -158,7 +158,7 @@ def build_cli_command(
 
 # --- Run the command ---
 def run_command(command: List[str], dry_run: bool, verbose: bool):
-    """Executes the command list using subprocess."""
+    """Executes the command list as a child process sharing our stdio."""
     cmd_str = " ".join(
         # Basic quoting for display
         f"'{arg}'" if " " in arg else arg
@@ -171,31 +171,20 @@ def run_command(command: List[str], dry_run: bool, verbose: bool):
     if verbose:
         print(f"Running: {cmd_str}", file=sys.stderr)
 
+    sys.stdout.flush()
+    sys.stderr.flush()
     try:
-        # Set encoding for reliable text processing
-        # Handle potential decoding errors
-        result = subprocess.run(
-            command,
-            check=True,
-            capture_output=True,
-            text=True,
-            encoding="utf-8",
-            errors="replace",
-        )
-        # Print stdout (the actual results)
-        print(result.stdout, end="")
-        # Print stderr (logs, warnings from qdb-cli) to stderr
-        if result.stderr:
-            print(result.stderr, file=sys.stderr, end="")
-    except subprocess.CalledProcessError as e:
-        print(f"Error executing command: {cmd_str}", file=sys.stderr)
-        print(f"Return Code: {e.returncode}", file=sys.stderr)
-        if e.stdout:
-            print(f"--- qdb-cli stdout ---\n{e.stdout}", file=sys.stderr)
-        if e.stderr:
-            print(f"--- qdb-cli stderr ---\n{e.stderr}", file=sys.stderr)
-        # Exit with the same code as the failed command
-        sys.exit(e.returncode)
+        if hasattr(os, "posix_spawnp"):
+            # Spawn without fork(): the child inherits our stdin/stdout/stderr,
+            # so its output streams straight through with no pipes or decoding.
+            pid = os.posix_spawnp(command[0], command, os.environ)
+            _, status = os.waitpid(pid, 0)
+            returncode = os.waitstatus_to_exitcode(status)
+        else:
+            # No posix_spawnp on this platform; subprocess is only imported here
+            import subprocess
+
+            returncode = subprocess.call(command)
     except FileNotFoundError:
         print("Error: 'qdb-cli' command not found.", file=sys.stderr)
         print("Please ensure it's installed and in your PATH.", file=sys.stderr)
@@ -203,6 +192,11 @@ def run_command(command: List[str], dry_run: bool, verbose: bool):
     except Exception as e:
         print(f"An unexpected error occurred: {e}", file=sys.stderr)
         sys.exit(1)
+    if returncode != 0:
+        print(f"Error executing command: {cmd_str}", file=sys.stderr)
+        print(f"Return Code: {returncode}", file=sys.stderr)
+        # Exit with the same code as the failed command
+        sys.exit(returncode)
 
 
 # --- Main Execution ---
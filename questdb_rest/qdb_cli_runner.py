@@ -0,0 +1,199 @@
+# questdb_rest/qdb_cli_runner.py
+# Shared query running for the search scripts (qdbtvs, qdbdcs, qdb-tables):
+# the qdb-cli invocation and the in-process REST client path.
+import functools
+import os
+import shlex
+import subprocess
+import sys
+from typing import Any, Dict, List, Optional, Tuple
+
+# qdb-cli's global connection options (see _add_parser_global in cli.py),
+# mapped to QuestDBClient.from_options() keyword arguments. Each takes a value.
+QDB_CLI_CONN_OPTIONS = {
+    "-H": "host",
+    "--host": "host",
+    "--port": "port",
+    "-u": "user",
+    "--user": "user",
+    "-p": "password",
+    "--password": "password",
+    "--timeout": "timeout",
+    "--scheme": "scheme",
+    "--config": "config_path",
+}
+_INT_CONN_OPTIONS = frozenset({"port", "timeout"})
+
+
+def build_qdb_cli_invocation(
+    sql_query: str,
+    passthrough_cli_args: List[str],
+    info: bool = False,
+    csv_output: bool = False,
+    no_header_csv: bool = False,
+    json_output: bool = False,
+) -> Tuple[List[str], str, List[str]]:
+    """
+    Returns (global_qdb_options, subcommand, subcmd_specific_args) for running
+    `sql_query` through qdb-cli: 'exp' for CSV output, plain 'exec' (JSON) for
+    `json_output`, 'exec --psql' otherwise.
+    """
+    qdb_global_options = []
+    if info:  # The script's --info flag controls qdb-cli's --info flag
+        qdb_global_options.append("--info")
+    # Add the correctly separated passthrough arguments
+    qdb_global_options.extend(passthrough_cli_args)
+    if csv_output:
+        # For 'qdb-cli exp', the query is a direct argument, not prefixed by -q
+        subcmd_specific_args = [sql_query]
+        if no_header_csv:
+            subcmd_specific_args.append("--nm")
+        return qdb_global_options, "exp", subcmd_specific_args
+    if json_output:
+        return qdb_global_options, "exec", ["-q", sql_query]
+    return qdb_global_options, "exec", ["-q", sql_query, "--psql"]
+
+
+def client_options_from_cli_args(cli_args: List[str]) -> Optional[Dict[str, Any]]:
+    """
+    Maps qdb-cli connection options in `cli_args` (e.g. ['--host', 'h',
+    '--port=9001']) to QuestDBClient.from_options() keyword arguments, so a
+    script can connect in-process exactly as qdb-cli would. Returns None if
+    anything in `cli_args` can only be handled by qdb-cli itself.
+    """
+    options: Dict[str, Any] = {}
+    i = 0
+    while i < len(cli_args):
+        flag, eq, value = cli_args[i].partition("=")
+        i += 1
+        dest = QDB_CLI_CONN_OPTIONS.get(flag)
+        if dest is None:
+            return None
+        if not eq:
+            if i >= len(cli_args):
+                return None
+            value = cli_args[i]
+            i += 1
+        if dest in _INT_CONN_OPTIONS:
+            try:
+                value = int(value)
+            except ValueError:
+                return None
+        options[dest] = value
+    if "user" in options and "password" not in options:
+        # qdb-cli resolves the password from its config or prompts for it
+        return None
+    return options
+
+
+@functools.lru_cache(maxsize=128)
+def _compose_qdb_cli_command(
+    global_qdb_options: Tuple[str, ...],
+    subcommand: str,
+    subcmd_specific_args: Tuple[str, ...],
+) -> Tuple[str, ...]:
+    # Cached for callers that dry-run the same command repeatedly; a tuple so
+    # the shared result can't be mutated.
+    return ("qdb-cli",) + global_qdb_options + (subcommand,) + subcmd_specific_args
+
+
+def run_qdb_cli(
+    global_qdb_options: List[str],
+    subcmd_specific_args: List[str],
+    dry_run: bool = False,
+    script_info_flag: bool = False,
+    subcommand: str = "exec",
+) -> None:
+    """
+    Constructs and runs the qdb-cli command.
+    `global_qdb_options` are options like --host, --port, and script's --info.
+    `subcmd_specific_args` are arguments for the `exec` or `exp` subcommand.
+    """
+    cmd_list = _compose_qdb_cli_command(
+        tuple(global_qdb_options), subcommand, tuple(subcmd_specific_args)
+    )
+    if dry_run:
+        # Written as bytes: for dry runs this line is the whole output
+        sys.stdout.flush()
+        sys.stdout.buffer.write(b"Dry run: " + shlex.join(cmd_list).encode() + b"\n")
+        sys.stdout.buffer.flush()
+        return
+    if not script_info_flag:
+        # Nothing to post-process: replace this process with qdb-cli so its
+        # output goes straight to our stdout/stderr and its exit code is ours.
+        sys.stdout.flush()
+        sys.stderr.flush()
+        try:
+            os.execvp(cmd_list[0], cmd_list)
+        except FileNotFoundError:
+            print("Error: 'qdb-cli' command not found.", file=sys.stderr)
+            print("Please ensure it's installed and in your PATH.", file=sys.stderr)
+            sys.exit(1)
+        except OSError as e:
+            print(
+                f"An unexpected error occurred running qdb-cli: {e}", file=sys.stderr
+            )
+            sys.exit(1)
+    sys.stdout.flush()
+    sys.stderr.flush()
+    sys.stderr.buffer.write(b"+ Running: " + shlex.join(cmd_list).encode() + b"\n")
+    sys.stderr.buffer.flush()
+    try:
+        # stdout is inherited, so results stream straight through without
+        # being buffered or decoded here. Only stderr is captured.
+        proc = subprocess.Popen(cmd_list, stdout=None, stderr=subprocess.PIPE)
+        _, stderr_bytes = proc.communicate()
+    except FileNotFoundError:
+        print("Error: 'qdb-cli' command not found.", file=sys.stderr)
+        print("Please ensure it's installed and in your PATH.", file=sys.stderr)
+        sys.exit(1)
+    except Exception as e:
+        print(f"An unexpected error occurred running qdb-cli: {e}", file=sys.stderr)
+        sys.exit(1)
+    stderr_text = stderr_bytes.decode("utf-8", errors="replace")
+    if proc.returncode != 0:
+        print(
+            f"Error: qdb-cli command failed with exit code {proc.returncode}.",
+            file=sys.stderr,
+        )
+        if stderr_text:
+            print(f"  qdb-cli stderr:\n{stderr_text.strip()}", file=sys.stderr)
+        sys.exit(proc.returncode)
+    if stderr_text:
+        sys.stderr.write(stderr_text)
+
+
+def exec_query_or_exit(client: Any, sql_query: str) -> Dict[str, Any]:
+    """
+    Runs `sql_query` with `client.exec()` and returns the /exec result. A
+    QuestDBError or an error response is printed as 'Error: ...' to stderr and
+    exits with status 1, as qdb-cli does.
+    """
+    # Imported here so scripts that only spawn qdb-cli never load the client
+    from questdb_rest import QuestDBError
+
+    try:
+        result = client.exec(sql_query)
+    except QuestDBError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+    if "error" in result:
+        print(f"Error: {result['error']}", file=sys.stderr)
+        sys.exit(1)
+    return result
+
+
+def print_psql_table(headers: List[str], rows: List[List[Any]]) -> None:
+    """Prints rows like 'qdb-cli exec --psql'; nothing for an empty result."""
+    if headers or rows:
+        from tabulate import tabulate
+
+        sys.stdout.write(tabulate(rows, headers=headers, tablefmt="psql") + "\n")
+
+
+def print_psql_result(result: Dict[str, Any]) -> None:
+    """print_psql_table() for an /exec result dictionary."""
+    print_psql_table(
+        [col["name"] for col in result.get("columns", [])],
+        result.get("dataset", []),
+    )
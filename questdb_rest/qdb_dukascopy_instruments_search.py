@@ -2,21 +2,9 @@
 # questdb_rest/qdbdcs.py
 import argparse
 from rich_argparse import RawTextRichHelpFormatter
-import subprocess
-import sys
-import shlex
 from typing import List, Optional
 
-# Attempt pypika import
-try:
-    from pypika import Query, Table, Field, Criterion, functions as fn
-    from pypika.terms import LiteralValue
-except ImportError:
-    print(
-        "Error: pypika library not found. Please install it: pip install pypika",
-        file=sys.stderr,
-    )
-    sys.exit(1)
+from questdb_rest.qdb_cli_runner import build_qdb_cli_invocation, run_qdb_cli
 
 # --- Constants ---
 DEFAULT_TABLE_NAME = "dukascopy_instruments"
@@ -28,7 +16,7 @@ DEFAULT_SEARCH_FIELD = "instrument_id"
 
 def setup_arg_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(
-        description=f"Search the {DEFAULT_TABLE_NAME} table in QuestDB using pypika and qdb-cli.",
+        description=f"Search the {DEFAULT_TABLE_NAME} table in QuestDB using qdb-cli.",
         formatter_class=RawTextRichHelpFormatter,
         epilog=f"""Examples:
   # Case-insensitive search for 'eurusd' in the default 'instrument_id' field
@@ -105,124 +93,45 @@ def setup_arg_parser() -> argparse.ArgumentParser:
 
 
 def build_sql_query(args: argparse.Namespace) -> str:
-    """Builds the SQL query using pypika and manual string appending for regex."""
-    instruments_table = Table(DEFAULT_TABLE_NAME)
-
-    # Start with selecting all columns
-    query_builder = Query.from_(instruments_table).select(instruments_table.star)
+    """Builds the SQL query as one SELECT with an AND-joined WHERE clause."""
+    # Identifiers come from constants or --field's choices; literals have their
+    # single quotes doubled.
+    sql_string = f'SELECT * FROM "{DEFAULT_TABLE_NAME}"'
 
     # --- Build WHERE conditions ---
-    pypika_conditions: List[Criterion] = []
-    raw_sql_conditions: List[str] = []
+    where_parts: List[str] = []
 
-    # 1. Group ID Filter (PyPika)
+    # 1. Group ID Filter
     if args.group_ids:
         # Case-sensitive match for group IDs typically
-        pypika_conditions.append(instruments_table.group_id.isin(args.group_ids))
-
-    # 2. Primary Search Filter (Raw SQL for '~' operator)
-    search_field = Field(args.field)
-    search_value = args.search_query
+        group_list = ",".join(
+            "'" + g.replace("'", "''") + "'" for g in args.group_ids
+        )
+        where_parts.append(f'"group_id" IN ({group_list})')
 
+    # 2. Primary Search Filter ('~' regex operator)
     # Escape single quotes in the search value for SQL safety
-    safe_search_value = search_value.replace("'", "''")
+    safe_search_value = args.search_query.replace("'", "''")
 
     if args.ignore_case:
         # Use LOWER() on both sides for case-insensitive regex match
-        # fn.Lower(search_field).get_sql() correctly generates LOWER("field_name")
-        column_expression = fn.Lower(search_field).get_sql(quote_char='"')
+        column_expression = f'LOWER("{args.field}")'
         # The pattern for ~ should also be lowercased
         pattern = safe_search_value.lower()
-        raw_sql_conditions.append(f"{column_expression} ~ '{pattern}'")
     else:
         # Case-sensitive regex match
-        column_expression = search_field.get_sql(quote_char='"')
+        column_expression = f'"{args.field}"'
         pattern = safe_search_value
-        raw_sql_conditions.append(f"{column_expression} ~ '{pattern}'")
+    where_parts.append(f"{column_expression} ~ '{pattern}'")
 
-    # --- Combine conditions ---
-    # Apply PyPika conditions first
-    if pypika_conditions:
-        query_builder = query_builder.where(Criterion.all(pypika_conditions))
-
-    # Get the SQL built by PyPika so far
-    sql_string = query_builder.get_sql(quote_char='"')
-
-    # Append raw SQL conditions
-    if raw_sql_conditions:
-        raw_sql_part = " AND ".join(raw_sql_conditions)
-        # Check if PyPika already added a WHERE clause
-        if " WHERE " in sql_string.upper():
-            sql_string += f" AND ({raw_sql_part})"
-        else:
-            sql_string += f" WHERE {raw_sql_part}"
+    if where_parts:
+        sql_string += " WHERE " + " AND ".join(where_parts)
 
     # Add semicolon
     sql_string += ";"
     return sql_string
 
 
-# --- qdb-cli Runner (Copied from qdbtvs, slightly adjusted comments) ---
-
-
-def run_qdb_cli(
-    global_qdb_options: List[str],
-    subcmd_specific_args: List[str],
-    dry_run: bool = False,
-    script_info_flag: bool = False,
-    subcommand: str = "exec",
-) -> None:
-    """
-    Constructs and runs the qdb-cli command.
-    `global_qdb_options` are options like --host, --port, and script's --info.
-    `subcmd_specific_args` are arguments for the `exec` or `exp` subcommand.
-    """
-    cmd_list = ["qdb-cli"]
-    cmd_list.extend(global_qdb_options)
-    cmd_list.append(subcommand)
-    cmd_list.extend(subcmd_specific_args)
-
-    if dry_run:
-        print(f"Dry run: {shlex.join(cmd_list)}")
-        return
-
-    if script_info_flag:  # Use the script's --info flag to decide whether to print this
-        print(f"+ Running: {shlex.join(cmd_list)}", file=sys.stderr)
-
-    try:
-        result = subprocess.run(
-            cmd_list,
-            check=True,
-            capture_output=True,
-            text=True,
-            encoding="utf-8",
-            errors="replace",
-        )
-        sys.stdout.write(result.stdout)
-        # Only print qdb-cli's stderr if the script's --info flag was set
-        if script_info_flag and result.stderr:
-            sys.stderr.write(result.stderr)
-
-    except FileNotFoundError:
-        print("Error: 'qdb-cli' command not found.", file=sys.stderr)
-        print("Please ensure it's installed and in your PATH.", file=sys.stderr)
-        sys.exit(1)
-    except subprocess.CalledProcessError as e:
-        print(
-            f"Error: qdb-cli command failed with exit code {e.returncode}.",
-            file=sys.stderr,
-        )
-        # Print captured output regardless of script's --info flag on error
-        if e.stdout:
-            print(f"  qdb-cli stdout:\n{e.stdout.strip()}", file=sys.stderr)
-        if e.stderr:
-            print(f"  qdb-cli stderr:\n{e.stderr.strip()}", file=sys.stderr)
-        sys.exit(e.returncode)
-    except Exception as e:
-        print(f"An unexpected error occurred running qdb-cli: {e}", file=sys.stderr)
-        sys.exit(1)
-
-
 # --- Main Execution ---
 
 
@@ -240,27 +149,16 @@ def main():
     # Build the SQL query
     sql_query = build_sql_query(args)
 
-    # Prepare global qdb-cli options (passthrough + script's --info)
-    qdb_global_options = []
-    if args.info:
-        qdb_global_options.append("--info")
-    if passthrough_cli_args:
-        qdb_global_options.extend(passthrough_cli_args)
-
-    # Determine subcommand and its specific arguments
-    subcmd_to_run: str
-    qdb_subcmd_specific_args: List[str]
-
-    if args.csv_output:
-        subcmd_to_run = "exp"
-        # 'exp' takes query directly
-        qdb_subcmd_specific_args = [sql_query]
-        if args.no_header_csv:
-            qdb_subcmd_specific_args.append("--nm")
-    else:
-        subcmd_to_run = "exec"
-        # 'exec' uses -q and default to --psql for table output
-        qdb_subcmd_specific_args = ["-q", sql_query, "--psql"]
+    # Prepare qdb-cli options (passthrough + script's --info) and subcommand
+    qdb_global_options, subcmd_to_run, qdb_subcmd_specific_args = (
+        build_qdb_cli_invocation(
+            sql_query,
+            passthrough_cli_args,
+            info=args.info,
+            csv_output=args.csv_output,
+            no_header_csv=args.no_header_csv,
+        )
+    )
 
     # Run the command
     run_qdb_cli(
@@ -57,9 +57,16 @@ DEFAULT_TYPES = ["float"]
 
 
 def run_qdb_cli(
-    cmd_args: List[str], check: bool = True, info: bool = False
+    cmd_args: List[str],
+    check: bool = True,
+    info: bool = False,
+    stream_stdout: bool = False,
 ) -> subprocess.CompletedProcess:
-    """Runs a qdb-cli command and returns the result."""
+    """
+    Runs a qdb-cli command and returns the result.
+    With `stream_stdout`, qdb-cli writes straight to our stdout (result.stdout
+    is None) instead of being buffered here; stderr is still captured.
+    """
     try:
         # Ensure 'qdb-cli' is the first element
         full_cmd = ["qdb-cli"]
@@ -71,12 +78,16 @@ def run_qdb_cli(
         # Only print if --info is passed to this script
         if info:
             print(f"+ Running: {shlex.join(full_cmd)}", file=sys.stderr)
+        if stream_stdout:
+            # Anything we printed must reach the shared stdout first
+            sys.stdout.flush()
         # Use text=True for automatic decoding, capture output
         # Handle potential decoding errors
         result = subprocess.run(
             full_cmd,
             check=check,
-            capture_output=True,
+            stdout=None if stream_stdout else subprocess.PIPE,
+            stderr=subprocess.PIPE,
             text=True,
             encoding="utf-8",
             errors="replace",
@@ -508,10 +519,10 @@ def main():
             )
             print(shlex.join(dry_run_full_cmd))
         else:
-            result = run_qdb_cli(
-                qdb_cmd_base, info=args.info
+            # Generated rows can be large: let qdb-cli stream them to stdout
+            run_qdb_cli(
+                qdb_cmd_base, info=args.info, stream_stdout=True
             )  # Pass script's info flag
-            print(result.stdout, end="")
             if args.info:
                 print(
                     f"\nData printed successfully ({output_format}).", file=sys.stderr
@@ -574,18 +585,18 @@ def main():
                     info=args.info,
                 )
                 create_cmd_args = qdb_exec_base_cmd + ["-q", create_sql]
-                # Construct the full command for dry run display
-                create_full_cmd_dry_run = ["qdb-cli"]
-                if args.info:
-                    create_full_cmd_dry_run.append("--info")
-                # Include original connection args
-                create_full_cmd_dry_run.extend(args.qdb_cli_args)
-                # Add the actual command part (exec only for create)
-                create_full_cmd_dry_run.extend(
-                    ["exec"] + qdb_exec_or_exp_extra_args + ["-q", create_sql]
-                )
-                create_cmd_str = shlex.join(create_full_cmd_dry_run)
                 if args.dry_run:
+                    # Construct the full command for dry run display only
+                    create_full_cmd_dry_run = ["qdb-cli"]
+                    if args.info:
+                        create_full_cmd_dry_run.append("--info")
+                    # Include original connection args
+                    create_full_cmd_dry_run.extend(args.qdb_cli_args)
+                    # Add the actual command part (exec only for create)
+                    create_full_cmd_dry_run.extend(
+                        ["exec"] + qdb_exec_or_exp_extra_args + ["-q", create_sql]
+                    )
+                    create_cmd_str = shlex.join(create_full_cmd_dry_run)
                     print("\n--- Dry Run: Command to CREATE table ---")
                     print(create_cmd_str)
                 else:
@@ -618,18 +629,18 @@ def main():
         try:
             insert_sql = build_insert_statement(table_name, select_list, args.rows)
             insert_cmd_args = qdb_exec_base_cmd + ["-q", insert_sql]
-            # Construct the full command for dry run display
-            insert_full_cmd_dry_run = ["qdb-cli"]
-            if args.info:
-                insert_full_cmd_dry_run.append("--info")
-            # Include original connection args
-            insert_full_cmd_dry_run.extend(args.qdb_cli_args)
-            # Add the actual command part (exec only for insert)
-            insert_full_cmd_dry_run.extend(
-                ["exec"] + qdb_exec_or_exp_extra_args + ["-q", insert_sql]
-            )
-            insert_cmd_str = shlex.join(insert_full_cmd_dry_run)
             if args.dry_run:
+                # Construct the full command for dry run display only
+                insert_full_cmd_dry_run = ["qdb-cli"]
+                if args.info:
+                    insert_full_cmd_dry_run.append("--info")
+                # Include original connection args
+                insert_full_cmd_dry_run.extend(args.qdb_cli_args)
+                # Add the actual command part (exec only for insert)
+                insert_full_cmd_dry_run.extend(
+                    ["exec"] + qdb_exec_or_exp_extra_args + ["-q", insert_sql]
+                )
+                insert_cmd_str = shlex.join(insert_full_cmd_dry_run)
                 print("\n--- Dry Run: Command to INSERT data ---")
                 print(insert_cmd_str)
                 # Show create command again if it would have run
@@ -1,32 +1,80 @@
 #!/usr/bin/env python3
 # qdb_search_tv_symbols.py
-import argparse
-from rich_argparse import RawTextRichHelpFormatter
-import subprocess
+import functools
+import json
+import logging
+import re
 import sys
-import shlex
-from typing import List, Optional
-
-try:
-    from pypika import Query, Table, Field, Criterion, functions as fn
-    from pypika.terms import LiteralValue
-except ImportError:
-    print(
-        "Error: pypika library not found. Please install it: pip install pypika",
-        file=sys.stderr,
-    )
-    sys.exit(1)
+from types import SimpleNamespace
+from typing import Any, Dict, List, Optional, Tuple
+
+from questdb_rest import QuestDBClient, QuestDBError
+from questdb_rest.qdb_cli_runner import (
+    QDB_CLI_CONN_OPTIONS,
+    build_qdb_cli_invocation,
+    client_options_from_cli_args,
+    exec_query_or_exit,
+    print_psql_result,
+    run_qdb_cli,
+)
+
 # --- Argument Parsing ---
 
 DEFAULT_TABLE_NAME_US = "tv_symbols_us"
 DEFAULT_TABLE_NAME_ALL = "tv_symbols"
+SELECT_PREFIX_US = f'SELECT "namespace","ticker","full" FROM "{DEFAULT_TABLE_NAME_US}"'
+SELECT_PREFIX_ALL = f'SELECT "namespace","ticker","full" FROM "{DEFAULT_TABLE_NAME_ALL}"'
+
+# Flags understood by the hand-rolled parser in parse_args().
+# Anything else starting with '-' is passed through to qdb-cli (e.g. --host).
+_BOOL_FLAGS = {
+    "-a": "search_all",
+    "--all": "search_all",
+    "-f": "full",
+    "--full": "full",
+    "-i": "info",
+    "--info": "info",
+    "-e": "exact",
+    "--exact": "exact",
+    "--prefix": "prefix",
+    "--suffix": "suffix",
+    "--compat-upper": "compat_upper",
+    "--use-cli": "use_cli",
+    "--dry-run": "dry_run",
+    "--csv": "csv_output",
+    "--json": "json_output",
+    "--no-header": "no_header_csv",
+}
+_NARGS_FLAGS = {"-n": "namespaces", "--namespaces": "namespaces"}
+
+# Passthrough flags whose value is the next argv token, e.g. '--host h'.
+_CONN_FLAGS = frozenset(QDB_CLI_CONN_OPTIONS)
+
+# A search term without any of these is a plain literal and can be matched
+# with ILIKE instead of a regex. '%' and '_' are LIKE wildcards, so terms
+# containing them stay on the regex path.
+_META_RE = re.compile(r"[.^$*+?()\[\]{}|\\%_]")
+
+_SQLQ_ESCAPE = str.maketrans({"'": "''"})
 
 
-def setup_arg_parser() -> argparse.ArgumentParser:
+def _escape_sql_literal(value: str) -> str:
+    # Doubles single quotes; the common quote-free case allocates nothing.
+    if "'" not in value:
+        return value
+    return value.translate(_SQLQ_ESCAPE)
+
+
+def setup_arg_parser():
+    # Only built for -h/--help and usage errors; argparse and rich_argparse
+    # are imported here so the common path doesn't pay for them.
+    import argparse
+    from rich_argparse import RawTextRichHelpFormatter
+
     parser = argparse.ArgumentParser(
-        description="Search the tv_symbols_us table in QuestDB using pypika and qdb-cli.",
+        description="Search the tv_symbols_us table in QuestDB using qdb-cli.",
         formatter_class=RawTextRichHelpFormatter,
-        epilog="This script is for self use only, it won't work for you unless you have the same db as mine.\n\nExamples:\n  # Case-insensitive search for 'spy' in the ticker field\n  %(prog)s spy\n\n  # Case-insensitive search for 'apple' in the full field\n  %(prog)s -f apple\n\n  # Search for 'goog' in ticker, filtered by NASDAQ and NYSE namespaces\n  %(prog)s goog -N NASDAQ NYSE\n  \n  # Search for 'aapl' and output as CSV\n  %(prog)s aapl --csv\n\n  # Search for 'msft' and output as CSV without header\n  %(prog)s msft --csv --no-header\n\n  # Dry run search for 'tsla' with --info for qdb-cli, and custom host\n  %(prog)s tsla --dry-run --info --host myquestdb.local\n",
+        epilog="This script is for self use only, it won't work for you unless you have the same db as mine.\n\nExamples:\n  # Case-insensitive search for 'spy' in the ticker field\n  %(prog)s spy\n\n  # Case-insensitive search for 'apple' in the full field\n  %(prog)s -f apple\n\n  # Exact ticker match for SPY or QQQ\n  %(prog)s -e SPY,QQQ\n\n  # Tickers starting with 'goo'\n  %(prog)s --prefix goo\n\n  # Search for 'goog' in ticker, filtered by NASDAQ and NYSE namespaces\n  %(prog)s goog -N NASDAQ NYSE\n  \n  # Search for 'aapl' and output as CSV\n  %(prog)s aapl --csv\n\n  # Search for 'msft' and output as CSV without header\n  %(prog)s msft --csv --no-header\n\n  # Search for 'nvda' and output the raw JSON response\n  %(prog)s nvda --json\n\n  # Dry run search for 'tsla' with --info for qdb-cli, and custom host\n  %(prog)s tsla --dry-run --info --host myquestdb.local\n",
     )
     parser.add_argument("search_query", help="The string to search for.")
     parser.add_argument(
@@ -50,12 +98,38 @@ def setup_arg_parser() -> argparse.ArgumentParser:
         default=[],
         help="Filter by one or more namespaces (e.g., AMEX NASDAQ). Requires at least one value if -N is used.",
     )
+    parser.add_argument(
+        "-e",
+        "--exact",
+        action="store_true",
+        help="Exact match instead of a search. SEARCH_QUERY may be a comma-separated list (e.g. SPY,QQQ); emits an IN (...) filter.",
+    )
+    parser.add_argument(
+        "--prefix",
+        action="store_true",
+        help="Only match values starting with SEARCH_QUERY (anchors the pattern with ^).",
+    )
+    parser.add_argument(
+        "--suffix",
+        action="store_true",
+        help="Only match values ending with SEARCH_QUERY (anchors the pattern with $). Combine with --prefix for a whole-value match.",
+    )
+    parser.add_argument(
+        "--compat-upper",
+        action="store_true",
+        help="For regex searches, match against UPPER(column) with an upper-cased pattern instead of using the inline (?i) flag.",
+    )
     parser.add_argument(
         "-i",
         "--info",
         action="store_true",
         help="Pass the --info flag to underlying qdb-cli calls for its verbose logging.",
     )
+    parser.add_argument(
+        "--use-cli",
+        action="store_true",
+        help="Run the query through a 'qdb-cli' subprocess instead of the in-process client. Implied when passthrough options other than connection options (--host, --port, -u, -p, --timeout, --scheme, --config) are given.",
+    )
     parser.add_argument(
         "--dry-run",
         action="store_true",
@@ -68,114 +142,239 @@ def setup_arg_parser() -> argparse.ArgumentParser:
         dest="csv_output",
         help="Output data as CSV using 'qdb-cli exp'. Default is PSQL table via 'qdb-cli exec'.",
     )
+    output_group.add_argument(
+        "--json",
+        action="store_true",
+        dest="json_output",
+        help="Output the raw /exec JSON response (what 'qdb-cli exec' prints without --psql). Skips the table-formatting pass, for programmatic callers.",
+    )
     output_group.add_argument(
         "--no-header",
         action="store_true",
         dest="no_header_csv",
         help="When using --csv, omit the header row from the CSV output (passes '--nm' to 'qdb-cli exp').",
     )
-    # Removed the explicit "qdb_cli_args" with nargs=REMAINDER.
-    # Passthrough args will be collected by parse_known_args() in main().
+    # Passthrough args are collected by parse_args() and handed to qdb-cli.
     return parser
 
 
+def _usage_error(message: str):
+    setup_arg_parser().error(message)
+
+
+def parse_args(argv: List[str]) -> Tuple[SimpleNamespace, List[str]]:
+    """
+    Single pass over argv. Returns (args, passthrough_cli_args) in the same
+    shape as argparse's parse_known_args(). Only qdb-cli connection options
+    are passed through by the fast path; --help, long-option abbreviations and
+    any other unrecognized option are left to argparse itself.
+    """
+    if "-h" in argv or "--help" in argv:
+        setup_arg_parser().parse_args(argv)  # prints help and exits
+    args = SimpleNamespace(search_query=None, namespaces=[])
+    for dest in _BOOL_FLAGS.values():
+        setattr(args, dest, False)
+    passthrough: List[str] = []
+    positional_only = False
+    i = 0
+    n = len(argv)
+    while i < n:
+        arg = argv[i]
+        i += 1
+        if positional_only or not arg.startswith("-") or arg == "-":
+            if args.search_query is None:
+                args.search_query = arg
+            else:
+                passthrough.append(arg)
+            continue
+        if arg == "--":
+            positional_only = True
+            continue
+        if arg in _BOOL_FLAGS:
+            setattr(args, _BOOL_FLAGS[arg], True)
+            continue
+        flag, eq, value = arg.partition("=")
+        nargs_value: Optional[str] = value if eq else None
+        if flag not in _NARGS_FLAGS and arg[1] != "-":
+            # Combined short flags, e.g. -fa, optionally ending in a value-
+            # taking flag with its value attached or following: -fnNYSE, -fn NYSE
+            for j, c in enumerate(arg[1:], 1):
+                if f"-{c}" in _NARGS_FLAGS:
+                    flag, rest = f"-{c}", arg[j + 1 :]
+                    nargs_value = rest.removeprefix("=") if rest else None
+                    break
+                if f"-{c}" not in _BOOL_FLAGS:
+                    flag = None
+                    break
+            else:
+                for c in arg[1:]:
+                    setattr(args, _BOOL_FLAGS[f"-{c}"], True)
+                continue
+            if flag is not None:
+                for c in arg[1:j]:
+                    setattr(args, _BOOL_FLAGS[f"-{c}"], True)
+        if flag in _NARGS_FLAGS:
+            values = [nargs_value] if nargs_value is not None else []
+            while nargs_value is None and i < n and not argv[i].startswith("-"):
+                values.append(argv[i])
+                i += 1
+            if not values:
+                _usage_error(f"argument {flag}: expected at least one argument")
+            setattr(args, _NARGS_FLAGS[flag], values)
+        elif arg in _CONN_FLAGS:
+            # Keep the option's value with it, so '--host h spy' doesn't
+            # take 'h' as the search query.
+            passthrough.append(arg)
+            if i < n:
+                passthrough.append(argv[i])
+                i += 1
+        elif eq and flag in _CONN_FLAGS:
+            passthrough.append(arg)
+        else:
+            # Abbreviated or unknown option: argparse resolves prefixes
+            # (--namespace, --dry) and collects the rest as passthrough
+            parsed, passthrough = setup_arg_parser().parse_known_args(argv)
+            return SimpleNamespace(**vars(parsed)), passthrough
+    return args, passthrough
+
+
 # --- SQL Query Building ---
 
 
-def build_sql_query(args: argparse.Namespace) -> str:
-    if args.search_all:
-        tv_symbols_us = Table("tv_symbols")
-    else:
-        tv_symbols_us = Table("tv_symbols_us")
-    # Start with selecting columns
-    query_builder = Query.from_(tv_symbols_us).select(
-        tv_symbols_us.namespace, tv_symbols_us.ticker, tv_symbols_us.full
-    )
-    # Conditions that PyPika can build fluently (like IN)
-    pypika_conditions: List[Criterion] = []
-    if args.namespaces:
-        pypika_conditions.append(
-            tv_symbols_us.namespace.isin([x.upper() for x in args.namespaces])
+def build_sql_query(args: SimpleNamespace) -> str:
+    # Memoized on the hashable search options, so repeat calls from a driver
+    # loop return the cached string. Namespaces are upper-cased, deduped and
+    # sorted so that '-n NYSE NASDAQ' and '-n nasdaq NYSE' produce the same SQL
+    # text (one cache entry here, one plan-cache entry on the server).
+    return _build_sql_query(
+        args.search_query,
+        full=args.full,
+        namespaces=tuple(sorted({ns.upper() for ns in args.namespaces})),
+        search_all=args.search_all,
+        exact=args.exact,
+        prefix=args.prefix,
+        suffix=args.suffix,
+        compat_upper=args.compat_upper,
+    )
+
+
+@functools.lru_cache(maxsize=256)
+def _build_sql_query(
+    search_query: str,
+    full: bool = False,
+    namespaces: Tuple[str, ...] = (),
+    search_all: bool = False,
+    exact: bool = False,
+    prefix: bool = False,
+    suffix: bool = False,
+    compat_upper: bool = False,
+) -> str:
+    # The query shape is fixed, so it's templated directly instead of going
+    # through a query builder.
+    sql_string = SELECT_PREFIX_ALL if search_all else SELECT_PREFIX_US
+    field = "full" if full else "ticker"
+    safe_search_query = _escape_sql_literal(search_query)
+    search_value_pattern = safe_search_query.upper()
+    if exact:
+        terms_sql = ",".join(
+            f"'{t.strip()}'" for t in search_value_pattern.split(",")
         )
-    if pypika_conditions:
-        query_builder = query_builder.where(Criterion.all(pypika_conditions))
-    # Get the SQL string built so far by PyPika
-    sql_string = query_builder.get_sql(quote_char='"')
-    # Now, build the raw SQL condition for the regex search
-    raw_sql_search_conditions: List[str] = []
-    search_value_pattern = args.search_query.upper().replace("'", "''")
-    if args.full:
-        # fn.Upper(Field).get_sql() is fine for getting the UPPER(column) part
-        field_expr_sql = fn.Upper(tv_symbols_us.full).get_sql(quote_char='"')
-        raw_sql_search_conditions.append(f"{field_expr_sql} ~ '{search_value_pattern}'")
+        # Tickers are stored upper-case, so they're compared as-is (keeping the
+        # plain IN on the symbol column); full names are mixed case, so the
+        # column is upper-cased to match the upper-cased terms.
+        column_sql = f'UPPER("{field}")' if full else f'"{field}"'
+        search_condition = f"{column_sql} IN ({terms_sql})"
+    elif _META_RE.search(search_query) is None:
+        # Plain literal: ILIKE lets QuestDB match on the column (and the symbol
+        # dictionary) directly instead of running a regex over UPPER(col).
+        like_pattern = (
+            ("" if prefix else "%")
+            + search_value_pattern
+            + ("" if suffix else "%")
+        )
+        search_condition = f"\"{field}\" ILIKE '{like_pattern}'"
     else:
-        field_expr_sql = fn.Upper(tv_symbols_us.ticker).get_sql(quote_char='"')
-        raw_sql_search_conditions.append(f"{field_expr_sql} ~ '{search_value_pattern}'")
-    # Append raw SQL search conditions
-    if raw_sql_search_conditions:
-        # Join multiple raw conditions with AND if there were ever a need for more than one raw search part
-        raw_sql_part = " AND ".join(raw_sql_search_conditions)
-        # Check if PyPika already added a WHERE clause (from namespaces filter)
-        if " WHERE " in sql_string.upper():
-            # Append using AND
-            sql_string += f" AND ({raw_sql_part})"
+        # Anchoring cuts down on the start offsets the matcher has to try.
+        # Don't add an anchor the user already typed.
+        if prefix and not safe_search_query.startswith("^"):
+            safe_search_query = "^" + safe_search_query
+            search_value_pattern = "^" + search_value_pattern
+        if suffix and not safe_search_query.endswith("$"):
+            safe_search_query += "$"
+            search_value_pattern += "$"
+        if compat_upper:
+            search_condition = f"UPPER(\"{field}\") ~ '{search_value_pattern}'"
         else:
-            # Add a new WHERE clause
-            sql_string += f" WHERE {raw_sql_part}"
+            # Let the regex engine fold case rather than calling UPPER() per row.
+            # The pattern is left as typed so escapes like \d keep their meaning.
+            search_condition = f"\"{field}\" ~ '(?i){safe_search_query}'"
+    if namespaces:
+        namespaces_sql = ",".join(
+            "'" + _escape_sql_literal(ns) + "'" for ns in namespaces
+        )
+        sql_string += (
+            f' WHERE "namespace" IN ({namespaces_sql}) AND ({search_condition})'
+        )
+    else:
+        sql_string += f" WHERE {search_condition}"
     # Add semicolon for QuestDB convention
     sql_string += ";"
     return sql_string
 
 
-# --- qdb-cli Runner ---
+# --- In-process Runner ---
+
+
+@functools.lru_cache(maxsize=None)
+def _get_client(conn_items: Tuple[Tuple[str, Any], ...]) -> QuestDBClient:
+    # One client per distinct connection setup, reused across calls when this
+    # module is driven programmatically.
+    return QuestDBClient.from_options(**dict(conn_items))
 
 
-def run_qdb_cli(
-    global_qdb_options: List[str],
-    subcmd_specific_args: List[str],
-    dry_run: bool = False,
+def run_query_in_process(
+    sql_query: str,
+    client_kwargs: Dict[str, Any],
+    csv_output: bool = False,
+    no_header_csv: bool = False,
     script_info_flag: bool = False,
-    subcommand: str = "exec",
-) -> None:  # Renamed from exec_specific_args
-    # Added subcommand parameter
-    "\n    Constructs and runs the qdb-cli command.\n    `global_qdb_options` are options like --host, --port, and script's --info.\n    `subcmd_specific_args` are arguments for the `exec` or `exp` subcommand.\n"
-    cmd_list = ["qdb-cli"]
-    cmd_list.extend(global_qdb_options)
-    cmd_list.append(subcommand)  # Use the specified subcommand
-    cmd_list.extend(subcmd_specific_args)
-    if dry_run:
-        print(f"Dry run: {shlex.join(cmd_list)}")
-        return
+    json_output: bool = False,
+) -> None:
+    """
+    Runs the query with the questdb_rest client directly, avoiding a qdb-cli
+    subprocess. Output matches 'qdb-cli exec --psql', 'qdb-cli exec' (JSON)
+    or 'qdb-cli exp'.
+    """
     if script_info_flag:
-        print(f"+ Running: {shlex.join(cmd_list)}", file=sys.stderr)
+        logging.basicConfig(format="%(levelname)s: %(message)s")
+        logging.getLogger("questdb_rest").setLevel(logging.INFO)
+        print(f"+ Query: {sql_query}", file=sys.stderr)
     try:
-        result = subprocess.run(
-            cmd_list,
-            check=True,
-            capture_output=True,
-            text=True,
-            encoding="utf-8",
-            errors="replace",
-        )
-        sys.stdout.write(result.stdout)
-        if result.stderr:
-            sys.stderr.write(result.stderr)
-    except FileNotFoundError:
-        print("Error: 'qdb-cli' command not found.", file=sys.stderr)
-        print("Please ensure it's installed and in your PATH.", file=sys.stderr)
-        sys.exit(1)
-    except subprocess.CalledProcessError as e:
-        print(
-            f"Error: qdb-cli command failed with exit code {e.returncode}.",
-            file=sys.stderr,
-        )
-        if e.stdout:
-            print(f"  qdb-cli stdout:\n{e.stdout.strip()}", file=sys.stderr)
-        if e.stderr:
-            print(f"  qdb-cli stderr:\n{e.stderr.strip()}", file=sys.stderr)
-        sys.exit(e.returncode)
-    except Exception as e:
-        print(f"An unexpected error occurred running qdb-cli: {e}", file=sys.stderr)
+        client = _get_client(tuple(sorted(client_kwargs.items())))
+        if csv_output:
+            response = client.exp(
+                sql_query, nm=True if no_header_csv else None, stream_response=True
+            )
+            try:
+                out = sys.stdout.buffer
+                last_chunk = b""
+                for chunk in response.iter_content(chunk_size=8192):
+                    if chunk:
+                        out.write(chunk)
+                        last_chunk = chunk
+                if last_chunk and not last_chunk.endswith(b"\n"):
+                    out.write(b"\n")
+            finally:
+                response.close()
+            return
+        result = exec_query_or_exit(client, sql_query)
+        if json_output:
+            json.dump(result, sys.stdout, indent=2)
+            sys.stdout.write("\n")
+            return
+        print_psql_result(result)
+    except QuestDBError as e:
+        print(f"Error: {e}", file=sys.stderr)
         sys.exit(1)
 
 
@@ -183,39 +382,37 @@ def run_qdb_cli(
 
 
 def main():
-    parser = setup_arg_parser()
-    # Use parse_known_args to separate script args from passthrough args
-    # Arguments defined in setup_arg_parser will be in 'args'.
-    # Unrecognized arguments will be in 'passthrough_cli_args'.
-    args, passthrough_cli_args = parser.parse_known_args()
+    # Script args land in 'args', unrecognized ones in 'passthrough_cli_args'.
+    args, passthrough_cli_args = parse_args(sys.argv[1:])
     if not args.search_query:
-        # This check might be redundant if search_query is mandatory and positional,
-        # but it's a good safeguard.
-        parser.error("the following arguments are required: search_query")
+        _usage_error("the following arguments are required: search_query")
     if args.no_header_csv and (not args.csv_output):
-        parser.error("--no-header can only be used with --csv.")
+        _usage_error("--no-header can only be used with --csv.")
+    if args.json_output and args.csv_output:
+        _usage_error("--json and --csv are mutually exclusive.")
     sql_query = build_sql_query(args)
-    qdb_global_options = []
-    if args.info:  # This script's --info flag controls qdb-cli's --info flag
-        qdb_global_options.append("--info")
-    # Add the correctly separated passthrough arguments
-    if passthrough_cli_args:
-        qdb_global_options.extend(passthrough_cli_args)
-    subcmd_to_run: str
-    qdb_subcmd_specific_args: List[str]
-    if args.csv_output:
-        subcmd_to_run = "exp"
-        # For 'qdb-cli exp', the query is a direct argument, not prefixed by -q
-        qdb_subcmd_specific_args = [sql_query]
-        if args.no_header_csv:
-            qdb_subcmd_specific_args.append("--nm")
-    else:
-        subcmd_to_run = "exec"
-        qdb_subcmd_specific_args = [
-            "-q",
+    if not (args.use_cli or args.dry_run):
+        client_kwargs = client_options_from_cli_args(passthrough_cli_args)
+        if client_kwargs is not None:
+            run_query_in_process(
+                sql_query,
+                client_kwargs,
+                csv_output=args.csv_output,
+                no_header_csv=args.no_header_csv,
+                script_info_flag=args.info,
+                json_output=args.json_output,
+            )
+            return
+    qdb_global_options, subcmd_to_run, qdb_subcmd_specific_args = (
+        build_qdb_cli_invocation(
             sql_query,
-            "--psql",
-        ]  # For this script's "+ Running" message
+            passthrough_cli_args,
+            info=args.info,
+            csv_output=args.csv_output,
+            no_header_csv=args.no_header_csv,
+            json_output=args.json_output,
+        )
+    )
     run_qdb_cli(
         global_qdb_options=qdb_global_options,
         subcmd_specific_args=qdb_subcmd_specific_args,
@@ -1,27 +1,25 @@
 #!/usr/bin/env python3
 import argparse
-from rich_argparse import RawTextRichHelpFormatter
-import subprocess
+import functools
+import itertools
+import json
+import os
+import re
+import shlex
 import sys
-from typing import List, Optional, Tuple
-
-# Attempt to import pypika, provide guidance if missing
-try:
-    from pypika import Criterion, Field, Order, Query, Table, functions as fn
-    from pypika.queries import QueryBuilder
-    from pypika.terms import PseudoColumn, LiteralValue
-except ImportError:
-    print(
-        "Error: pypika library not found. Please install it: pip install pypika",
-        file=sys.stderr,
-    )
-    sys.exit(1)
+import time
+from types import SimpleNamespace
+from typing import Any, List, Optional, Tuple
+
 # --- Constants ---
 # Regex matching UUID-4 with either dashes or underscores (same as bash)
 UUID_REGEX = "[0-9a-f]{8}([-_][0-9a-f]{4}){3}[-_][0-9a-f]{12}"
+# Cheap shape check ANDed in front of UUID_REGEX for -u: names without 8
+# consecutive hex chars are rejected before the full pattern is evaluated
+UUID_PREFILTER_REGEX = "[0-9a-f]{8}"
 # Known columns in the 'tables()' function result for validation
 # Changed from name for clarity with Field name
-KNOWN_TABLES_COLS = [
+KNOWN_TABLES_COLS = (
     "id",
     "table_name",
     "designatedTimestamp",
@@ -34,18 +32,45 @@ KNOWN_TABLES_COLS = [
     "ttlValue",
     "ttlUnit",
     "matView",
-]
-PARTITION_OPTIONS = ["NONE", "YEAR", "MONTH", "DAY", "HOUR", "WEEK"]
+)
+PARTITION_OPTIONS = ("NONE", "YEAR", "MONTH", "DAY", "HOUR", "WEEK")
+# Set views for validation lookups; the ordered tuples above are kept for help text
+KNOWN_TABLES_COLS_SET = frozenset(KNOWN_TABLES_COLS)
+PARTITION_OPTIONS_SET = frozenset(PARTITION_OPTIONS)
+# What build_sql_query() yields when no flags are given
+BARE_LISTING_SQL = 'SELECT "table_name" FROM tables()'
+# Full tables() listing kept between runs by --cache-ttl
+TABLES_CACHE_PATH = os.path.join(
+    os.path.expanduser("~"), ".cache", "qdb-rest", "tables.json"
+)
+# Help text, built once at import rather than on every parser construction
+_EPILOG = "Examples:\n  # list all table names (default order)\n  qdb-tables\n\n  # list tables matching 'trade' AND 'usd'\n  qdb-tables trade usd\n\n  # list tables matching 'trade' but NOT 'backup' or 'temp'\n  qdb-tables trade -v backup temp\n\n  # list tables NOT matching 'backup_' or starting with 'test_'\n  qdb-tables -v backup_ 'test_.*'\n\n  # list tables NOT matching 'backup_' or starting with 'test_' case-insensitively\n  qdb-tables -i -v backup_ 'test_.*'\n\n  # list tables matching 'cme_liq' case-insensitively\n  qdb-tables -i cme_liq\n\n  # list tables partitioned by YEAR or MONTH\n  qdb-tables -P YEAR,MONTH\n\n  # list WAL tables with deduplication enabled and a designated timestamp\n  qdb-tables -d -t\n\n  # show full info for tables starting with 'trade', partitioned by DAY\n  qdb-tables -f -P DAY trades_\n\n  # show full info for tables matching 'cme_liq' and NOT 'test', with length >= 10\n  qdb-tables cme_liq -v test -l 10 -f\n\n  # list tables matching 'cme_liq' that have no designated timestamp\n  qdb-tables cme_liq -T\n\n  # list tables with id >= 5 and id <= 10\n  qdb-tables --min-id 5 --max-id 10\n\n  # list tables sorted by name descending, limit 10\n  qdb-tables -s table_name -r -n 10\n\n  # list tables sorted by default (table_name) ascending, limit 5\n  qdb-tables -s -n 5\n"
+_PARTITION_HELP = f"Filter by partitioning strategy. P is a comma-separated list (no spaces) of values like {','.join(PARTITION_OPTIONS)}. Example: -P YEAR,MONTH"
+_SORT_HELP = f"Sort results by column COL. Defaults to 'table_name' if COL is omitted. Available columns: {', '.join(KNOWN_TABLES_COLS)}. If -s is not used, results are ordered by 'id' (so '-s id' alone adds no ORDER BY)."
 # --- Argument Parsing ---
 
 
+def _parse_partitions(value: str) -> List[str]:
+    """argparse type for -P: split, normalize and validate once at parse time."""
+    partitions = [p.strip().upper() for p in value.split(",")]
+    invalid_partitions = [p for p in partitions if p not in PARTITION_OPTIONS_SET]
+    if invalid_partitions:
+        raise argparse.ArgumentTypeError(
+            f"Invalid partitionBy value(s): {','.join(invalid_partitions)}. "
+            f"Available options: {','.join(PARTITION_OPTIONS)}"
+        )
+    return partitions
+
+
+@functools.lru_cache(maxsize=1)
 def setup_arg_parser() -> argparse.ArgumentParser:  # Use python script name
+    # Imported here so the fast path in parse_common_args() never loads rich
+    from rich_argparse import RawTextRichHelpFormatter
+
     parser = argparse.ArgumentParser(
         description="Get a list of table names or full table info from QuestDB, with filtering and sorting options.",
         formatter_class=RawTextRichHelpFormatter,
-        epilog="Examples:\n  # list all table names (default order)\n  {prog}\n\n  # list tables matching 'trade' AND 'usd'\n  {prog} trade usd\n\n  # list tables matching 'trade' but NOT 'backup' or 'temp'\n  {prog} trade -v backup temp\n\n  # list tables NOT matching 'backup_' or starting with 'test_'\n  {prog} -v backup_ 'test_.*'\n\n  # list tables NOT matching 'backup_' or starting with 'test_' case-insensitively\n  {prog} -i -v backup_ 'test_.*'\n\n  # list tables matching 'cme_liq' case-insensitively\n  {prog} -i cme_liq\n\n  # list tables partitioned by YEAR or MONTH\n  {prog} -P YEAR,MONTH\n\n  # list WAL tables with deduplication enabled and a designated timestamp\n  {prog} -d -t\n\n  # show full info for tables starting with 'trade', partitioned by DAY\n  {prog} -f -P DAY trades_\n\n  # show full info for tables matching 'cme_liq' and NOT 'test', with length >= 10\n  {prog} cme_liq -v test -l 10 -f\n\n  # list tables matching 'cme_liq' that have no designated timestamp\n  {prog} cme_liq -T\n\n  # list tables with id >= 5 and id <= 10\n  {prog} --min-id 5 --max-id 10\n\n  # list tables sorted by name descending, limit 10\n  {prog} -s table_name -r -n 10\n\n  # list tables sorted by default (table_name) ascending, limit 5\n  {prog} -s -n 5\n".format(
-            prog="qdb-tables"
-        ),
+        epilog=_EPILOG,
     )
     # --- Filtering Options ---
     # Changed from '?' to '*'
@@ -88,7 +113,8 @@ def setup_arg_parser() -> argparse.ArgumentParser:  # Use python script name
         "-P",
         "--partitionBy",
         metavar="P",
-        help=f"Filter by partitioning strategy. P is a comma-separated list (no spaces) of values like {','.join(PARTITION_OPTIONS)}. Example: -P YEAR,MONTH",
+        type=_parse_partitions,
+        help=_PARTITION_HELP,
     )
     ts_group = parser.add_mutually_exclusive_group()
     ts_group.add_argument(
@@ -133,7 +159,7 @@ def setup_arg_parser() -> argparse.ArgumentParser:  # Use python script name
         nargs="?",
         const="table_name",
         metavar="COL",
-        help=f"Sort results by column COL. Defaults to 'table_name' if COL is omitted. Available columns: {', '.join(KNOWN_TABLES_COLS)}. If -s is not used, results are typically ordered by 'id'.",
+        help=_SORT_HELP,
     )
     parser.add_argument(
         "-r",
@@ -146,7 +172,7 @@ def setup_arg_parser() -> argparse.ArgumentParser:  # Use python script name
         "--limit",
         type=int,
         metavar="N",
-        help="Limit the number of results returned. Passes '-l N' to qdb-cli.",
+        help="Limit the number of results returned (appended to the query as LIMIT N, so QuestDB stops once N rows are found).",
     )
     # --- Output Options ---
     parser.add_argument(
@@ -155,9 +181,88 @@ def setup_arg_parser() -> argparse.ArgumentParser:  # Use python script name
         action="store_true",
         help="Show all columns from the 'tables' table in PSQL format. (Default: shows only table names, one per line)",
     )
+    parser.add_argument(
+        "--use-cli",
+        action="store_true",
+        help="Run the query through a 'qdb-cli' subprocess instead of the in-process REST client.",
+    )
+    parser.add_argument(
+        "--batch",
+        metavar="FILE",
+        help="Read one set of qdb-tables options per line from FILE ('-' for stdin), fetch tables() once and apply every set client-side. Result sets are separated by a form feed. Regexes are matched with Python's re rather than QuestDB's Java regex engine. Other filter options on the command line are ignored.",
+    )
+    parser.add_argument(
+        "--cache-ttl",
+        type=float,
+        metavar="SECONDS",
+        help=f"Reuse the full tables() listing cached in {TABLES_CACHE_PATH} if it is younger than SECONDS and was fetched from the same server, applying the filters client-side (regexes via Python's re, as with --batch). On a miss the listing is fetched and the cache rewritten. Not used with --use-cli.",
+    )
     return parser
 
 
+# Defaults of every destination setup_arg_parser() defines
+_ARG_DEFAULTS = {
+    "regex": [],
+    "inverse_regexes": [],
+    "case_insensitive": False,
+    "uuid": False,
+    "no_uuid": False,
+    "partitionBy": None,
+    "has_designated_timestamp": False,
+    "no_designated_timestamp": False,
+    "dedup_enabled": False,
+    "dedup_disabled": False,
+    "min_length": None,
+    "max_length": None,
+    "min_id": None,
+    "max_id": None,
+    "sort": None,
+    "reverse": False,
+    "limit": None,
+    "full_cols": False,
+    "use_cli": False,
+    "batch": None,
+    "cache_ttl": None,
+}
+# Destinations that don't change which rows or columns are selected
+_NON_FILTER_ARGS = frozenset({"limit", "use_cli", "batch", "cache_ttl"})
+
+
+def parse_common_args(argv: List[str]) -> Optional[SimpleNamespace]:
+    """
+    Hand-parses the common invocations (regex patterns plus -f and/or -n N)
+    without building the argparse parser. Returns None for anything else,
+    in which case the caller falls back to setup_arg_parser().parse_args().
+    """
+    args = SimpleNamespace(**_ARG_DEFAULTS)
+    regex: List[str] = []
+    # argparse only accepts the positional patterns as one contiguous run
+    positional_run_done = False
+    i = 0
+    while i < len(argv):
+        arg = argv[i]
+        if not arg.startswith("-"):
+            if positional_run_done:
+                return None
+            regex.append(arg)
+        else:
+            if regex:
+                positional_run_done = True
+            if arg in ("-f", "--full-cols"):
+                args.full_cols = True
+            elif arg in ("-n", "--limit") and i + 1 < len(argv):
+                value = argv[i + 1]
+                if not (value.isascii() and value.isdigit()):
+                    return None
+                args.limit = int(value)
+                i += 1
+            else:
+                return None
+        i += 1
+    args.regex = regex
+    return args
+
+
 # --- Helper to validate arguments after parsing ---
 
 
@@ -167,22 +272,10 @@ def validate_args(args: argparse.Namespace):
             "Error: -r|--reverse requires -s|--sort to be specified.", file=sys.stderr
         )
         sys.exit(1)
-    if args.sort and args.sort not in KNOWN_TABLES_COLS:
+    if args.sort and args.sort not in KNOWN_TABLES_COLS_SET:
         print(f"Error: Invalid sort column '{args.sort}'.", file=sys.stderr)
         print(f"Available columns: {', '.join(KNOWN_TABLES_COLS)}", file=sys.stderr)
         sys.exit(1)
-    if args.partitionBy:
-        partitions = args.partitionBy.split(",")
-        invalid_partitions = [
-            p for p in partitions if p.strip().upper() not in PARTITION_OPTIONS
-        ]
-        if invalid_partitions:
-            print(
-                f"Error: Invalid partitionBy value(s): {','.join(invalid_partitions)}",
-                file=sys.stderr,
-            )
-            print(f"Available options: {','.join(PARTITION_OPTIONS)}", file=sys.stderr)
-            sys.exit(1)
     if (
         args.min_id is not None
         and args.max_id is not None
@@ -199,109 +292,94 @@ def validate_args(args: argparse.Namespace):
 
 
 def build_sql_query(args: argparse.Namespace) -> str:
-    # Use PseudoColumn for 'tables' as it's a function call in QuestDB SQL
-    tables_func = PseudoColumn("tables()")
-    # Treat the result like a table for selection/filtering/ordering
-    tables_table = Table("tables")  # PyPika needs a Table object here
-    # Start building the query with SELECT and FROM
-    query = Query.from_(tables_func).select(
-        tables_table.star if args.full_cols else tables_table.table_name
-    )
+    # The query is a single small SELECT against the tables() function, so it is
+    # assembled directly as a string. Every interpolated identifier or keyword is
+    # checked against KNOWN_TABLES_COLS / PARTITION_OPTIONS before we get here,
+    # numbers are ints from argparse, and regex literals have quotes doubled.
+    # Plain listing (at most a limit): the query is a constant, so skip the
+    # per-filter checks below. Derived from _ARG_DEFAULTS so a new filter
+    # option can't be missed here.
+    if all(
+        getattr(args, dest) == default
+        for dest, default in _ARG_DEFAULTS.items()
+        if dest not in _NON_FILTER_ARGS
+    ):
+        if args.limit is None:
+            return BARE_LISTING_SQL
+        return f"{BARE_LISTING_SQL} LIMIT {int(args.limit)}"
+    select_expr = "*" if args.full_cols else '"table_name"'
+    sql_string = f"SELECT {select_expr} FROM tables()"
     # --- Build WHERE Clause ---
-    # Collect conditions supported directly by PyPika
-    pypika_conditions: List[Criterion] = []
+    where: List[str] = []
     # Partition By Filter
+    # (already split, upper-cased and validated by _parse_partitions)
     if args.partitionBy:
-        partitions = [p.strip().upper() for p in args.partitionBy.split(",")]
-        if partitions:
-            pypika_conditions.append(tables_table.partitionBy.isin(partitions))
+        where.append(
+            f"\"partitionBy\" IN ({','.join(repr(p) for p in args.partitionBy)})"
+        )
     # Designated Timestamp Filter
     if args.has_designated_timestamp:
-        pypika_conditions.append(tables_table.designatedTimestamp.isnotnull())
+        where.append('"designatedTimestamp" IS NOT NULL')
     elif args.no_designated_timestamp:
-        pypika_conditions.append(tables_table.designatedTimestamp.isnull())
+        where.append('"designatedTimestamp" IS NULL')
     # Deduplication Filter
     if args.dedup_enabled:
-        pypika_conditions.append(tables_table.dedup == True)
+        where.append('"dedup"=true')
     elif args.dedup_disabled:
-        pypika_conditions.append(tables_table.dedup == False)
-    # Length Filters
-    if args.min_length is not None:
-        pypika_conditions.append(fn.Length(tables_table.table_name) >= args.min_length)
-    if args.max_length is not None:
-        pypika_conditions.append(fn.Length(tables_table.table_name) <= args.max_length)
+        where.append('"dedup"=false')
+    # Length Filters (one BETWEEN when both bounds are given, so QuestDB
+    # computes LENGTH() once per row). Inverted bounds keep the two one-sided
+    # predicates, which match nothing, rather than rely on BETWEEN's bound order.
+    min_length, max_length = args.min_length, args.max_length
+    if min_length is not None and max_length is not None and min_length <= max_length:
+        where.append(
+            f'LENGTH("table_name") BETWEEN {int(min_length)} AND {int(max_length)}'
+        )
+    else:
+        if min_length is not None:
+            where.append(f'LENGTH("table_name")>={int(min_length)}')
+        if max_length is not None:
+            where.append(f'LENGTH("table_name")<={int(max_length)}')
     # ID Filters
     if args.min_id is not None:
-        pypika_conditions.append(tables_table.id >= args.min_id)
+        where.append(f'"id">={int(args.min_id)}')
     if args.max_id is not None:
-        pypika_conditions.append(tables_table.id <= args.max_id)
-    # Apply PyPika conditions if any exist
-    if pypika_conditions:
-        query = query.where(Criterion.all(pypika_conditions))
-    # Collect conditions requiring raw SQL strings
-    raw_sql_conditions: List[str] = []
-    # Determine the column expression for regex matching based on case sensitivity
+        where.append(f'"id"<={int(args.max_id)}')
+    # Determine the column expression for regex matching based on case
+    # sensitivity; the column expression and the pattern transform are loop
+    # invariants, so they are chosen once here
     table_name_expr = "LOWER(table_name)" if args.case_insensitive else "table_name"
-    # Positive Regex Filters (args.regex is now a list)
-    for pattern in args.regex:
-        # Basic escaping for single quotes in the pattern
-        safe_regex = pattern.replace("'", "''")
-        if args.case_insensitive:
-            safe_regex = safe_regex.lower()
-        # Use the correct column expression based on case sensitivity
-        raw_sql_conditions.append(f"{table_name_expr} ~ '{safe_regex}'")
-    # Inverse Regex Filters (args.inverse_regexes is now a list)
-    for pattern in args.inverse_regexes:
+    transform = str.lower if args.case_insensitive else str
+    # Positive (args.regex) and inverse (args.inverse_regexes) regex filters,
+    # in one pass over (pattern, operator) pairs
+    for pattern, op in itertools.chain(
+        ((p, "~") for p in args.regex),
+        ((p, "!~") for p in args.inverse_regexes),
+    ):
         # Basic escaping for single quotes in the pattern
-        safe_regex = pattern.replace("'", "''")
-        if args.case_insensitive:
-            safe_regex = safe_regex.lower()
-        # Use the correct column expression based on case sensitivity
-        raw_sql_conditions.append(f"{table_name_expr} !~ '{safe_regex}'")
+        safe_regex = transform(pattern.replace("'", "''"))
+        where.append(f"{table_name_expr} {op} '{safe_regex}'")
     # UUID Filter (case insensitive is irrelevant for UUID format)
     # UUID regex is case-insensitive by definition [0-9a-f]
-    uuid_table_name_expr = "table_name"
     if args.uuid:
-        raw_sql_conditions.append(f"{uuid_table_name_expr} ~ '{UUID_REGEX}'")
+        where.append(f"table_name ~ '{UUID_PREFILTER_REGEX}'")
+        where.append(f"table_name ~ '{UUID_REGEX}'")
     elif args.no_uuid:
-        raw_sql_conditions.append(f"{uuid_table_name_expr} !~ '{UUID_REGEX}'")
-    # Get the SQL string generated by PyPika so far
-    # Use get_sql() for consistency, though str() often works
-    sql_string = query.get_sql()
-    # Append raw SQL conditions if any exist
-    if raw_sql_conditions:
-        raw_sql_part = " AND ".join(raw_sql_conditions)
-        # Check if PyPika already added a WHERE clause by looking for ' WHERE '
-        # This is a bit fragile but simpler than tracking query._wheres state manually
-        # after potential modifications or if get_sql() doesn't expose it easily.
-        if " WHERE " in sql_string.upper():
-            # Append using AND
-            sql_string += f" AND ({raw_sql_part})"
-        else:
-            # Add a new WHERE clause
-            sql_string += f" WHERE {raw_sql_part}"
-    # Apply ORDER BY (append manually as well for simplicity and correctness with tables())
-    if args.sort:
-        # Quote the sort column name for safety, especially if it contains spaces or keywords
-        # Pypika's LiteralValue with quote_char handles this
-        sort_col_sql = LiteralValue(args.sort).get_sql(quote_char='"')
-        order_by_clause = f" ORDER BY {sort_col_sql}"
-        if args.reverse:
-            order_by_clause += " DESC"
-        sql_string += order_by_clause
-    # --- Post-processing for QuestDB syntax ---
-    # Pypika doesn't quote function calls like tables(), remove quotes manually
-    sql_string = sql_string.replace('"tables()"', "tables()")
-    # Pypika might quote fields from the pseudo-table 'tables', remove those too
-    # Ensure we only remove the prefix, not occurrences within names
-    sql_string = sql_string.replace('"tables"."', '"')  # Replace qualified name prefix
-    # Also handle the case where it might just select 'tables'.*
-    sql_string = sql_string.replace('"tables".*', "*")
-    # Handle cases where column names might still be qualified if selected individually (less likely now)
-    for col in KNOWN_TABLES_COLS:
-        sql_string = sql_string.replace(f'"tables"."{col}"', f'"{col}"')
-    # Handle potential quoting of LOWER function by pypika if it were used (it's raw now)
-    # sql_string = sql_string.replace('"LOWER"', 'LOWER') # Likely not needed as it's raw string
+        where.append(f"table_name !~ '{UUID_REGEX}'")
+    if where:
+        sql_string += " WHERE " + " AND ".join(where)
+    # --- ORDER BY ---
+    # tables() already returns rows in id order, so an ascending sort on id is
+    # a no-op and is left out
+    if args.sort and not (args.sort == "id" and not args.reverse):
+        # args.sort was validated against KNOWN_TABLES_COLS; quote it since
+        # several columns are camelCase
+        sql_string += f' ORDER BY "{args.sort}"{" DESC" if args.reverse else ""}'
+    # --- LIMIT ---
+    # Pushed into the query rather than passed as /exec's 'limit' parameter or
+    # qdb-cli's -l, so the row cap is applied by the server as part of the query
+    if args.limit is not None:
+        sql_string += f" LIMIT {int(args.limit)}"
     return sql_string
 
 
@@ -313,14 +391,12 @@ def build_cli_command(args: argparse.Namespace, sql_query: str) -> List[str]:
     if args.full_cols:
         cmd.append("--psql")
     else:
-        # If only showing names, extract that column via qdb-cli
-        # QuestDB CLI's -x option automatically handles single-column output without headers
-        # No need to explicitly specify the column name here if the SQL already selects only one.
-        # However, if full_cols is false, our SQL *does* select only table_name.
-        # Let's keep -x table_name for clarity and robustness, ensuring only names are printed.
-        cmd.extend(["-x", "table_name"])
-    if args.limit is not None:
-        cmd.extend(["-l", str(args.limit)])  # Pass limit to qdb-cli
+        # If only showing names, extract that column via qdb-cli, one per line.
+        # The SELECT already projects table_name alone (only --full-cols changes
+        # the projection), so extract column 0 by index and skip qdb-cli's
+        # column-name lookup.
+        cmd.extend(["-x", "0"])
+    # Any -n limit is already part of sql_query
     return cmd
 
 
@@ -328,47 +404,259 @@ def build_cli_command(args: argparse.Namespace, sql_query: str) -> List[str]:
 
 
 def run_command(command: List[str]):
+    # Nothing is post-processed here, so replace this process with qdb-cli:
+    # its output goes straight to our stdout/stderr and its exit code is ours.
+    sys.stdout.flush()
+    sys.stderr.flush()
     try:
-        # Set encoding for reliable text processing
-        # Handle potential decoding errors
-        result = subprocess.run(
-            command,
-            check=True,
-            capture_output=True,
-            text=True,
-            encoding="utf-8",
-            errors="replace",
-        )
-        # Print stdout (the actual results)
-        print(result.stdout, end="")
-        # Print stderr (logs, warnings) to stderr
-        if result.stderr:
-            print(result.stderr, file=sys.stderr, end="")
-    except subprocess.CalledProcessError as e:
-        print(f"Error executing command: {' '.join(command)}", file=sys.stderr)
-        print(f"Return Code: {e.returncode}", file=sys.stderr)
-        if e.stdout:
-            print(f"stdout:\n{e.stdout}", file=sys.stderr)
-        if e.stderr:
-            print(f"stderr:\n{e.stderr}", file=sys.stderr)
-        sys.exit(e.returncode)
+        os.execvp(command[0], command)
     except FileNotFoundError:
         print("Error: 'qdb-cli' command not found.", file=sys.stderr)
         print("Please ensure it's installed and in your PATH.", file=sys.stderr)
         sys.exit(1)
-    except Exception as e:
+    except OSError as e:
         print(f"An unexpected error occurred: {e}", file=sys.stderr)
         sys.exit(1)
 
 
+# --- Run the query in-process ---
+
+
+def run_query_in_process(args: argparse.Namespace, sql_query: str) -> None:
+    """
+    Runs the query with the questdb_rest client directly instead of spawning
+    qdb-cli, which would pay for a second interpreter start-up. Output matches
+    'qdb-cli exec -x 0' (names, one per line) or 'qdb-cli exec --psql'.
+    """
+    from questdb_rest import QuestDBClient
+    from questdb_rest.qdb_cli_runner import exec_query_or_exit, print_psql_result
+    from questdb_rest.utils import _qdb_exec_result_dict_extract_field
+
+    # Same connection defaults as qdb-cli (~/.questdb-rest/config.json).
+    # Any -n limit is already part of sql_query.
+    result = exec_query_or_exit(QuestDBClient(), sql_query)
+    if args.full_cols:
+        print_psql_result(result)
+        return
+    names = _qdb_exec_result_dict_extract_field(result, 0)
+    if names:
+        sys.stdout.write("\n".join(map(str, names)) + "\n")
+
+
+# --- Batch mode: filter one tables() snapshot client-side ---
+
+
+def _read_tables_cache(
+    endpoint: str, ttl: float
+) -> Optional[Tuple[List[str], List[List[Any]]]]:
+    """Returns the cached (column_names, rows) if fresh and from 'endpoint'."""
+    try:
+        if time.time() - os.path.getmtime(TABLES_CACHE_PATH) >= ttl:
+            return None
+        with open(TABLES_CACHE_PATH, "rb") as f:
+            data = f.read()
+        try:
+            import orjson
+
+            cached = orjson.loads(data)
+        except ImportError:
+            cached = json.loads(data)
+    except (OSError, ValueError):
+        # Missing, unreadable or corrupt cache: treat as a miss
+        return None
+    if not isinstance(cached, dict) or cached.get("endpoint") != endpoint:
+        return None
+    columns, rows = cached.get("columns"), cached.get("dataset")
+    if not isinstance(columns, list) or not isinstance(rows, list):
+        return None
+    return columns, rows
+
+
+def _write_tables_cache(
+    endpoint: str, columns: List[str], rows: List[List[Any]]
+) -> None:
+    # Written to a temp file and renamed over the cache, so a concurrent
+    # reader sees either the old listing or the new one, never a partial file
+    cache_dir = os.path.dirname(TABLES_CACHE_PATH)
+    tmp_path = f"{TABLES_CACHE_PATH}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"endpoint": endpoint, "columns": columns, "dataset": rows}, f)
+        os.replace(tmp_path, TABLES_CACHE_PATH)
+    except OSError as e:
+        # The cache is only an optimization; the listing was still fetched
+        print(f"Warning: could not write {TABLES_CACHE_PATH}: {e}", file=sys.stderr)
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+
+
+@functools.lru_cache(maxsize=1)
+def fetch_tables(
+    cache_ttl: Optional[float] = None,
+) -> Tuple[List[str], List[List[Any]]]:
+    """
+    Runs 'SELECT * FROM tables()' once per process and returns
+    (column_names, rows) for the client-side filters to share. With
+    'cache_ttl', a listing cached on disk by an earlier run within that many
+    seconds is used instead of querying.
+    """
+    from questdb_rest import QuestDBClient
+    from questdb_rest.qdb_cli_runner import exec_query_or_exit
+
+    client = QuestDBClient()
+    if cache_ttl is not None:
+        cached = _read_tables_cache(client.base_url, cache_ttl)
+        if cached is not None:
+            return cached
+    result = exec_query_or_exit(client, "SELECT * FROM tables()")
+    columns = [col["name"] for col in result["columns"]]
+    if cache_ttl is not None:
+        _write_tables_cache(client.base_url, columns, result["dataset"])
+    return columns, result["dataset"]
+
+
+@functools.lru_cache(maxsize=256)
+def _compile_regex(pattern: str) -> "re.Pattern[str]":
+    try:
+        return re.compile(pattern)
+    except re.error as e:
+        # QuestDB's '~' uses Java regex syntax, some of which Python's re
+        # rejects (e.g. named groups written '(?<name>...)')
+        print(
+            f"Error: cannot apply regex '{pattern}' client-side: {e}",
+            file=sys.stderr,
+        )
+        sys.exit(1)
+
+
+def filter_tables_rows(
+    args: argparse.Namespace, columns: List[str], rows: List[List[Any]]
+) -> List[List[Any]]:
+    """
+    Applies the same filters, sort and limit as build_sql_query() to rows of
+    'SELECT * FROM tables()', in Python. Regexes are matched with Python's re,
+    not QuestDB's (Java) regex engine, so patterns using syntax only one of
+    them supports can behave differently or be rejected.
+    """
+    col = {name: i for i, name in enumerate(columns)}
+    name_i = col["table_name"]
+    checks = []
+    # Case-insensitive matching lowercases both sides, as the SQL does
+    fold = str.lower if args.case_insensitive else str
+    for pattern in args.regex:
+        search = _compile_regex(fold(pattern)).search
+        checks.append(lambda row, search=search: search(fold(row[name_i])) is not None)
+    for pattern in args.inverse_regexes:
+        search = _compile_regex(fold(pattern)).search
+        checks.append(lambda row, search=search: search(fold(row[name_i])) is None)
+    if args.uuid or args.no_uuid:
+        uuid_search, want = _compile_regex(UUID_REGEX).search, bool(args.uuid)
+        checks.append(lambda row: (uuid_search(row[name_i]) is not None) == want)
+    if args.partitionBy:
+        partitions, part_i = frozenset(args.partitionBy), col["partitionBy"]
+        checks.append(lambda row: row[part_i] in partitions)
+    if args.has_designated_timestamp or args.no_designated_timestamp:
+        ts_i, want = col["designatedTimestamp"], bool(args.has_designated_timestamp)
+        checks.append(lambda row: (row[ts_i] is not None) == want)
+    if args.dedup_enabled or args.dedup_disabled:
+        dedup_i, want = col["dedup"], bool(args.dedup_enabled)
+        checks.append(lambda row: row[dedup_i] == want)
+    if args.min_length is not None:
+        checks.append(lambda row: len(row[name_i]) >= args.min_length)
+    if args.max_length is not None:
+        checks.append(lambda row: len(row[name_i]) <= args.max_length)
+    if args.min_id is not None:
+        id_i = col["id"]
+        checks.append(lambda row: row[id_i] >= args.min_id)
+    if args.max_id is not None:
+        id_i = col["id"]
+        checks.append(lambda row: row[id_i] <= args.max_id)
+    selected = [row for row in rows if all(check(row) for check in checks)]
+    if args.sort:
+        sort_i = col[args.sort]
+        # NULLs first, like QuestDB's ascending order
+        selected.sort(
+            key=lambda row: (row[sort_i] is not None, row[sort_i]),
+            reverse=args.reverse,
+        )
+    if args.limit is not None:
+        # Same meaning as SQL LIMIT: a negative N keeps the last N rows
+        if args.limit < 0:
+            selected = selected[args.limit :]
+        else:
+            selected = selected[: args.limit]
+    return selected
+
+
+def _parse_batch_spec(line: str) -> argparse.Namespace:
+    argv = shlex.split(line)
+    args = parse_common_args(argv)
+    if args is None:
+        args = setup_arg_parser().parse_args(argv)
+        validate_args(args)
+    return args
+
+
+def print_tables_rows(
+    args: argparse.Namespace, columns: List[str], rows: List[List[Any]]
+) -> None:
+    """Prints client-side filtered rows the way the SQL path prints results."""
+    if args.full_cols:
+        from questdb_rest.qdb_cli_runner import print_psql_table
+
+        print_psql_table(columns, rows)
+    elif rows:
+        name_i = columns.index("table_name")
+        sys.stdout.write("\n".join(str(row[name_i]) for row in rows) + "\n")
+
+
+def run_batch(batch_file: str, cache_ttl: Optional[float] = None) -> None:
+    """
+    Runs every option set in 'batch_file' against one cached tables() fetch,
+    printing one result set per non-blank line, separated by form feeds.
+    """
+    if batch_file == "-":
+        lines = sys.stdin.read().splitlines()
+    else:
+        with open(batch_file, "r", encoding="utf-8") as f:
+            lines = f.read().splitlines()
+    specs = [_parse_batch_spec(line) for line in lines if line.strip()]
+    if not specs:
+        return
+    columns, rows = fetch_tables(cache_ttl)
+    for n, args in enumerate(specs):
+        if n:
+            sys.stdout.write("\f\n")
+        print_tables_rows(args, columns, filter_tables_rows(args, columns, rows))
+
+
 # --- Main Execution ---
 
 
 def main():
-    parser = setup_arg_parser()
-    args = parser.parse_args()
-    validate_args(args)
-    sql_query = build_sql_query(args)
+    if len(sys.argv) == 1:
+        # Plain listing: the query is constant, so skip parsing and building it
+        args = SimpleNamespace(**_ARG_DEFAULTS)
+        sql_query = BARE_LISTING_SQL
+    else:
+        args = parse_common_args(sys.argv[1:])
+        if args is None:
+            args = setup_arg_parser().parse_args()
+            validate_args(args)
+        if args.batch:
+            run_batch(args.batch, args.cache_ttl)
+            return
+        if args.cache_ttl is not None and not args.use_cli:
+            columns, rows = fetch_tables(args.cache_ttl)
+            print_tables_rows(args, columns, filter_tables_rows(args, columns, rows))
+            return
+        sql_query = build_sql_query(args)
+    if not args.use_cli:
+        run_query_in_process(args, sql_query)
+        return
     cli_command = build_cli_command(args, sql_query)
     # Optional: Print the command for debugging
     # print(f"Executing: {' '.join(cli_command)}", file=sys.stderr)
@@ -1,88 +1,49 @@
-from typing import List, Dict, Any, Union
+from operator import itemgetter
+from typing import List, Dict, Any, Tuple, Union
 
 
-def _qdb_exec_result_dict_extract_field(
-    result_dict: Dict[str, Any], field: Union[str, int]
-) -> List[Any]:
+def _column_name_indexes(columns_info: List[Any]) -> Dict[str, int]:
     """
-    Extracts values of a specified field from a QuestDB exec result dictionary.
-
-    The dictionary is expected to follow the structure of the QuestDB /exec endpoint
-    JSON response, containing 'columns' and 'dataset' keys. If 'field' is a string
-    and an exact match isn't found, it attempts a case-insensitive match.
-
-    Args:
-        result_dict: A dictionary representing the QuestDB JSON response.
-        field: The field to extract, either by column name (str) or
-               0-based index (int).
-
-    Returns:
-        A list containing the values from the specified column in the dataset.
-
-    Raises:
-        TypeError: If 'result_dict' is not a dictionary or 'field' is not a
-                   string or an integer.
-        KeyError: If 'result_dict' is missing 'columns' or 'dataset' keys.
-        ValueError: If 'field' is a string but the column name is not found (neither
-                    exactly nor case-insensitively), or if 'field' is an integer
-                    index that is out of range.
-        IndexError: If the dataset rows have inconsistent lengths and the
-                    determined index is out of bounds for a specific row.
+    Maps column names to their 0-based index in a single pass over 'columns_info'.
+    When names repeat, the first index wins, as it would for a front-to-back scan.
+    """
+    by_name: Dict[str, int] = {}
+    for i, col_info in enumerate(columns_info):
+        if isinstance(col_info, dict):
+            name = col_info.get("name")
+            if name is not None:
+                by_name.setdefault(name, i)
+    return by_name
+
+
+def _resolve_column_index(
+    columns_info: List[Any],
+    field: Union[str, int],
+    name_indexes: Dict[str, int],
+) -> Tuple[int, str]:
+    """
+    Returns (column_index, column_name_found) for 'field', a column name or a
+    0-based index. 'name_indexes' is the result of _column_name_indexes().
+    Raises TypeError/ValueError as documented on
+    _qdb_exec_result_dict_extract_field.
     """
-    if not isinstance(result_dict, dict):
-        raise TypeError("Input 'result_dict' must be a dictionary.")
-
-    # Check for essential keys
-    if "columns" not in result_dict:
-        raise KeyError("Input dictionary missing required key: 'columns'")
-    if "dataset" not in result_dict:
-        raise KeyError("Input dictionary missing required key: 'dataset'")
-
-    columns_info = result_dict["columns"]
-    dataset = result_dict["dataset"]
     num_columns = len(columns_info)
 
-    if not isinstance(columns_info, list):
-        raise TypeError("Key 'columns' must be a list.")
-    if not isinstance(dataset, list):
-        raise TypeError("Key 'dataset' must be a list.")
-
-    column_index = -1
-    column_name_found = None  # Store the actual found column name for clarity
-
     # Determine the column index based on the type of 'field'
     if isinstance(field, str):
         column_name_to_find = field
         # 1. Try exact match first
-        for i, col_info in enumerate(columns_info):
-            if isinstance(col_info, dict):
-                current_col_name = col_info.get("name")
-                if current_col_name == column_name_to_find:
-                    column_index = i
-                    column_name_found = current_col_name
-                    break  # Found exact match
-
-        # 2. If no exact match, try case-insensitive match
+        column_index = name_indexes.get(column_name_to_find, -1)
+
+        # 2. Only on a miss, scan for the first case-insensitive match
         if column_index == -1:
+            target = column_name_to_find.lower()
             for i, col_info in enumerate(columns_info):
                 if isinstance(col_info, dict):
-                    current_col_name = col_info.get("name")
-                    # Check if name exists and compare lowercased versions
-                    if (
-                        current_col_name is not None
-                        and current_col_name.lower() == column_name_to_find.lower()
-                    ):
-                        # Ensure we don't overwrite an exact match if it somehow failed the first check
-                        # Or handle multiple case-insensitive matches (here, we take the first one)
-                        if column_index == -1:
-                            column_index = i
-                            column_name_found = current_col_name
-                            # Decide if you want to break after the first case-insensitive match
-                            # break
-                        else:
-                            # Optional: Handle ambiguity if multiple case-insensitive matches exist
-                            # For now, we just keep the first one found.
-                            pass
+                    name = col_info.get("name")
+                    if isinstance(name, str) and name.lower() == target:
+                        column_index = i
+                        break
 
         # 3. If still not found, raise error
         if column_index == -1:
@@ -94,36 +55,59 @@ def _qdb_exec_result_dict_extract_field(
             raise ValueError(
                 f"Column name '{column_name_to_find}' not found (case-insensitive search also failed). Available columns: {available_columns}"
             )
+        return column_index, columns_info[column_index]["name"]
 
     elif isinstance(field, int):
         requested_index = field
         if 0 <= requested_index < num_columns:
-            column_index = requested_index
-            if requested_index < len(columns_info) and isinstance(
-                columns_info[requested_index], dict
-            ):
+            if isinstance(columns_info[requested_index], dict):
                 column_name_found = columns_info[requested_index].get(
                     "name", f"[Index {requested_index}]"
                 )
             else:
                 column_name_found = f"[Index {requested_index}]"
-        else:
-            # Handle case where there are no columns gracefully
-            if num_columns == 0:
-                raise ValueError(
-                    f"Cannot access index {requested_index}: There are no columns defined."
-                )
-            else:
-                raise ValueError(
-                    f"Column index {requested_index} is out of range (must be between 0 and {num_columns - 1})."
-                )
-
-    else:
-        raise TypeError(
-            f"Input 'field' must be a string (column name) or an integer (index), but got {type(field).__name__}."
+            return requested_index, column_name_found
+        # Handle case where there are no columns gracefully
+        if num_columns == 0:
+            raise ValueError(
+                f"Cannot access index {requested_index}: There are no columns defined."
+            )
+        raise ValueError(
+            f"Column index {requested_index} is out of range (must be between 0 and {num_columns - 1})."
         )
 
-    # Extract the data using the determined column index
+    raise TypeError(
+        f"Input 'field' must be a string (column name) or an integer (index), but got {type(field).__name__}."
+    )
+
+
+def _checked_columns_and_dataset(
+    result_dict: Dict[str, Any],
+) -> Tuple[List[Any], List[Any]]:
+    """Validates the /exec response structure and returns (columns, dataset)."""
+    if not isinstance(result_dict, dict):
+        raise TypeError("Input 'result_dict' must be a dictionary.")
+
+    # Check for essential keys
+    if "columns" not in result_dict:
+        raise KeyError("Input dictionary missing required key: 'columns'")
+    if "dataset" not in result_dict:
+        raise KeyError("Input dictionary missing required key: 'dataset'")
+
+    columns_info = result_dict["columns"]
+    dataset = result_dict["dataset"]
+
+    if not isinstance(columns_info, list):
+        raise TypeError("Key 'columns' must be a list.")
+    if not isinstance(dataset, list):
+        raise TypeError("Key 'dataset' must be a list.")
+    return columns_info, dataset
+
+
+def _extract_column_checked(
+    dataset: List[Any], column_index: int, column_name_found: str
+) -> List[Any]:
+    """Row-by-row extraction that raises a descriptive error for the first bad row."""
     extracted_values = []
     for i, row in enumerate(dataset):
         if not isinstance(row, list):
@@ -135,5 +119,93 @@ def _qdb_exec_result_dict_extract_field(
             raise IndexError(
                 f"Row {i} (value: {row}) has length {len(row)}, but tried to access index {column_index} (for column '{column_name_found}')."
             )
-
     return extracted_values
+
+
+def _qdb_exec_result_dict_extract_field(
+    result_dict: Dict[str, Any], field: Union[str, int]
+) -> List[Any]:
+    """
+    Extracts values of a specified field from a QuestDB exec result dictionary.
+
+    The dictionary is expected to follow the structure of the QuestDB /exec endpoint
+    JSON response, containing 'columns' and 'dataset' keys. If 'field' is a string
+    and an exact match isn't found, it attempts a case-insensitive match.
+
+    Args:
+        result_dict: A dictionary representing the QuestDB JSON response.
+        field: The field to extract, either by column name (str) or
+               0-based index (int).
+
+    Returns:
+        A list containing the values from the specified column in the dataset.
+
+    Raises:
+        TypeError: If 'result_dict' is not a dictionary or 'field' is not a
+                   string or an integer.
+        KeyError: If 'result_dict' is missing 'columns' or 'dataset' keys.
+        ValueError: If 'field' is a string but the column name is not found (neither
+                    exactly nor case-insensitively), or if 'field' is an integer
+                    index that is out of range.
+        IndexError: If the dataset rows have inconsistent lengths and the
+                    determined index is out of bounds for a specific row.
+    """
+    columns_info, dataset = _checked_columns_and_dataset(result_dict)
+    column_index, column_name_found = _resolve_column_index(
+        columns_info, field, _column_name_indexes(columns_info)
+    )
+
+    # Extract the data using the determined column index. Every row's type is
+    # checked first (indexing a str row would silently return a character),
+    # then the C-level map(itemgetter) pass runs; if either fails, the per-row
+    # loop runs to report which row is malformed.
+    if all(type(row) is list for row in dataset):
+        try:
+            return list(map(itemgetter(column_index), dataset))
+        except IndexError:
+            pass
+    return _extract_column_checked(dataset, column_index, column_name_found)
+
+
+def qdb_exec_result_dict_extract_fields(
+    result_dict: Dict[str, Any], fields: List[Union[str, int]]
+) -> Dict[Union[str, int], List[Any]]:
+    """
+    Extracts several fields from a QuestDB exec result dictionary at once.
+
+    Column names are indexed once for all 'fields', and the dataset is walked
+    a single time. Name matching and errors are the same as for
+    _qdb_exec_result_dict_extract_field.
+
+    Args:
+        result_dict: A dictionary representing the QuestDB JSON response.
+        fields: Column names (str) and/or 0-based indexes (int) to extract.
+
+    Returns:
+        A dict mapping each requested field, as given, to its list of values.
+    """
+    columns_info, dataset = _checked_columns_and_dataset(result_dict)
+    name_indexes = _column_name_indexes(columns_info)
+    # Output lists are allocated at full size up front and filled by index,
+    # so they never grow (and reallocate) while walking the dataset
+    num_rows = len(dataset)
+    targets = [
+        (
+            field,
+            [None] * num_rows,
+            *_resolve_column_index(columns_info, field, name_indexes),
+        )
+        for field in dict.fromkeys(fields)  # each distinct field once
+    ]
+    for i, row in enumerate(dataset):
+        if not isinstance(row, list):
+            raise TypeError(f"Dataset item at index {i} is not a list: {row}")
+        for _, values, column_index, column_name_found in targets:
+            try:
+                values[i] = row[column_index]
+            except IndexError:
+                raise IndexError(
+                    f"Row {i} (value: {row}) has length {len(row)}, but tried to access index {column_index} (for column '{column_name_found}')."
+                )
+
+    return {field: values for field, values, _, _ in targets}
@@ -0,0 +1,131 @@
+import unittest
+
+from questdb_rest.qdb_tv_symbols_search import build_sql_query, parse_args
+
+US = 'SELECT "namespace","ticker","full" FROM "tv_symbols_us"'
+
+
+def sql_for(*argv: str) -> str:
+    args, _ = parse_args(list(argv))
+    return build_sql_query(args)
+
+
+class TestBuildSqlQuery(unittest.TestCase):
+    def test_literal_uses_ilike(self):
+        self.assertEqual(sql_for("spy"), f"{US} WHERE \"ticker\" ILIKE '%SPY%';")
+
+    def test_literal_full_field_and_all_table(self):
+        self.assertEqual(
+            sql_for("-a", "-f", "apple"),
+            'SELECT "namespace","ticker","full" FROM "tv_symbols" '
+            "WHERE \"full\" ILIKE '%APPLE%';",
+        )
+
+    def test_literal_quote_is_escaped(self):
+        self.assertEqual(
+            sql_for("o'neil"), f"{US} WHERE \"ticker\" ILIKE '%O''NEIL%';"
+        )
+
+    def test_literal_prefix_suffix_anchors(self):
+        self.assertEqual(
+            sql_for("--prefix", "goo"), f"{US} WHERE \"ticker\" ILIKE 'GOO%';"
+        )
+        self.assertEqual(
+            sql_for("--suffix", "goo"), f"{US} WHERE \"ticker\" ILIKE '%GOO';"
+        )
+        self.assertEqual(
+            sql_for("--prefix", "--suffix", "goo"),
+            f"{US} WHERE \"ticker\" ILIKE 'GOO';",
+        )
+
+    def test_like_wildcards_take_regex_path(self):
+        self.assertEqual(sql_for("a_b"), f"{US} WHERE \"ticker\" ~ '(?i)a_b';")
+
+    def test_regex_uses_inline_case_flag(self):
+        self.assertEqual(sql_for("sp.\\d"), f"{US} WHERE \"ticker\" ~ '(?i)sp.\\d';")
+
+    def test_regex_prefix_suffix_anchors(self):
+        self.assertEqual(
+            sql_for("--prefix", "--suffix", "sp."),
+            f"{US} WHERE \"ticker\" ~ '(?i)^sp.$';",
+        )
+        # An anchor the user already typed isn't doubled
+        self.assertEqual(
+            sql_for("--prefix", "^sp."), f"{US} WHERE \"ticker\" ~ '(?i)^sp.';"
+        )
+
+    def test_compat_upper(self):
+        self.assertEqual(
+            sql_for("--compat-upper", "--prefix", "sp."),
+            f"{US} WHERE UPPER(\"ticker\") ~ '^SP.';",
+        )
+
+    def test_exact_ticker_in_list(self):
+        self.assertEqual(
+            sql_for("-e", "spy, QQQ"), f"{US} WHERE \"ticker\" IN ('SPY','QQQ');"
+        )
+
+    def test_exact_full_compares_upper_cased(self):
+        self.assertEqual(
+            sql_for("-e", "-f", "Apple Inc"),
+            f"{US} WHERE UPPER(\"full\") IN ('APPLE INC');",
+        )
+
+    def test_namespaces_normalized(self):
+        self.assertEqual(
+            sql_for("spy", "-n", "nyse", "NASDAQ", "NYSE"),
+            f"{US} WHERE \"namespace\" IN ('NASDAQ','NYSE') "
+            "AND (\"ticker\" ILIKE '%SPY%');",
+        )
+
+
+class TestParseArgs(unittest.TestCase):
+    def test_flags_and_search_query(self):
+        args, passthrough = parse_args(["-fa", "spy", "--prefix", "--json"])
+        self.assertEqual(args.search_query, "spy")
+        self.assertTrue(args.full and args.search_all and args.prefix)
+        self.assertTrue(args.json_output)
+        self.assertEqual(passthrough, [])
+
+    def test_namespaces_forms(self):
+        for argv in (
+            ["spy", "-n", "NASDAQ"],
+            ["spy", "-nNASDAQ"],
+            ["spy", "-n=NASDAQ"],
+            ["spy", "--namespaces=NASDAQ"],
+            ["spy", "--namespace", "NASDAQ"],
+        ):
+            with self.subTest(argv=argv):
+                args, passthrough = parse_args(argv)
+                self.assertEqual(args.search_query, "spy")
+                self.assertEqual(args.namespaces, ["NASDAQ"])
+                self.assertEqual(passthrough, [])
+
+    def test_value_flag_ends_combined_group(self):
+        args, _ = parse_args(["-fn", "NASDAQ", "NYSE", "--", "spy"])
+        self.assertTrue(args.full)
+        self.assertEqual(args.namespaces, ["NASDAQ", "NYSE"])
+        self.assertEqual(args.search_query, "spy")
+        args, _ = parse_args(["-fnNASDAQ", "spy"])
+        self.assertTrue(args.full)
+        self.assertEqual(args.namespaces, ["NASDAQ"])
+        self.assertEqual(args.search_query, "spy")
+
+    def test_long_option_abbreviation(self):
+        args, passthrough = parse_args(["spy", "--dry"])
+        self.assertTrue(args.dry_run)
+        self.assertEqual(passthrough, [])
+
+    def test_connection_options_pass_through_with_values(self):
+        args, passthrough = parse_args(["--host", "db", "spy", "--port=9001"])
+        self.assertEqual(args.search_query, "spy")
+        self.assertEqual(passthrough, ["--host", "db", "--port=9001"])
+
+    def test_unknown_options_pass_through(self):
+        args, passthrough = parse_args(["spy", "--stop-on-error"])
+        self.assertEqual(args.search_query, "spy")
+        self.assertEqual(passthrough, ["--stop-on-error"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,70 @@
+import unittest
+
+from questdb_rest.utils import (
+    _qdb_exec_result_dict_extract_field,
+    qdb_exec_result_dict_extract_fields,
+)
+
+RESULT = {
+    "columns": [
+        {"name": "id", "type": "INT"},
+        {"name": "table_name", "type": "STRING"},
+        {"name": "dedup", "type": "BOOLEAN"},
+    ],
+    "dataset": [[1, "trades", True], [2, "quotes", False]],
+}
+
+
+class TestExtractFields(unittest.TestCase):
+    def test_multiple_columns(self):
+        self.assertEqual(
+            qdb_exec_result_dict_extract_fields(RESULT, ["table_name", 0, "DEDUP"]),
+            {
+                "table_name": ["trades", "quotes"],
+                0: [1, 2],
+                "DEDUP": [True, False],
+            },
+        )
+
+    def test_repeated_field(self):
+        self.assertEqual(
+            qdb_exec_result_dict_extract_fields(RESULT, ["id", "id"]),
+            {"id": [1, 2]},
+        )
+
+    def test_missing_column(self):
+        with self.assertRaises(ValueError):
+            qdb_exec_result_dict_extract_fields(RESULT, ["id", "nope"])
+        with self.assertRaises(ValueError):
+            qdb_exec_result_dict_extract_fields(RESULT, [3])
+
+    def test_empty_dataset(self):
+        result = {"columns": RESULT["columns"], "dataset": []}
+        self.assertEqual(
+            qdb_exec_result_dict_extract_fields(result, ["id", "table_name"]),
+            {"id": [], "table_name": []},
+        )
+
+    def test_short_row(self):
+        result = {"columns": RESULT["columns"], "dataset": [[1, "trades", True], [2]]}
+        with self.assertRaises(IndexError):
+            qdb_exec_result_dict_extract_fields(result, ["table_name"])
+
+    def test_matches_single_field_extraction(self):
+        for field in ("id", "table_name", 2):
+            with self.subTest(field=field):
+                self.assertEqual(
+                    qdb_exec_result_dict_extract_fields(RESULT, [field])[field],
+                    _qdb_exec_result_dict_extract_field(RESULT, field),
+                )
+
+
+class TestExtractField(unittest.TestCase):
+    def test_non_list_row_after_first_raises(self):
+        result = {"columns": RESULT["columns"], "dataset": [[1, "trades", True], "xy"]}
+        with self.assertRaises(TypeError):
+            _qdb_exec_result_dict_extract_field(result, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()